@@ -17,16 +17,17 @@ Tables created:
 - postmortems: Trading reflections
 """
 
-from pathlib import Path
 import sys
-from models import init_database, get_db_session, Market, Config
+from models import init_database, get_db_session, get_database_path, Market, Config
+
+# Database location, shared with models (including the FOMO_BOT_DB override)
+_DB_PATH = get_database_path()
+_DB_DIR = _DB_PATH.parent
 
 def create_database_directory():
     """Create the database directory if it doesn't exist"""
-    project_root = Path(__file__).parent.parent.parent
-    db_dir = project_root / "database"
-    db_dir.mkdir(parents=True, exist_ok=True)
-    return db_dir / "fomo-bot-DB.sqlite"
+    _DB_DIR.mkdir(parents=True, exist_ok=True)
+    return _DB_PATH
 
 def setup_database(force=False):
     """
@@ -108,20 +109,18 @@ def populate_initial_data():
             Market(symbol="EUR/USD", description="Euro/US Dollar"),
         ]
         
-        for market in sample_markets:
-            session.add(market)
-            print(f"   ✓ Added {market.symbol} - {market.description}")
-        
         # Create default config
         default_config = Config(
             timezone='Europe/Berlin',
             star_filter=1  # Analyze all events by default
         )
-        session.add(default_config)
         
+        session.add_all(sample_markets + [default_config])
         session.commit()
         session.close()
         
+        for market in sample_markets:
+            print(f"   ✓ Added {market.symbol} - {market.description}")
         print("✅ Initial data populated successfully!")
         print()
         
@@ -1,118 +1,215 @@
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import functools
 import logging
+import re
 import time
-from models import get_db_session, Config, EconomicEvent, EventAnalysis, Market
+from sqlalchemy import and_, or_
+from models import SessionLocal, Config, EconomicEvent, EventAnalysis, Market
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson is optional - it parses bytes directly in C, the stdlib parser is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+DEFAULT_LLM_MODEL = 'gpt-4o-mini'
+
+# Markdown code fence around the JSON reply, e.g. ```json ... ```
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*(?:```)?$", re.S)
+# Fallback extraction on the lowercased reply: the first number after 'impact' on a line, and
+# the sentiment keywords (scanned separately so an impact line can still carry the sentiment)
+_IMPACT_RE = re.compile(r"impact[^\n\d]*(\d+)")
+_SENTIMENT_RE = re.compile(r"bullish|bearish")
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> Dict:
+    """
+    Load the latest config row once and keep a plain snapshot of the values the analyzer needs
+    """
+    with SessionLocal() as session:
+        config = session.query(Config).order_by(Config.created_at.desc()).first()
+    
+    return {
+        'api_key': config.llm_api_key if config else None,
+        'model': config.llm_model if config and config.llm_model else DEFAULT_LLM_MODEL,
+        'star_filter': config.star_filter if config and config.star_filter else 1  # Default to analyze all events
+    }
+
+@functools.lru_cache(maxsize=32)
+def _prompt_template_for_market(market_symbol: str) -> Tuple[str, str]:
+    """
+    Build the market-specific parts of the analysis prompt once per market
+    
+    Returns:
+        (header, footer) - the event-specific lines go in between
+    """
+    header = f"""
+Analyze this economic event for {market_symbol} market impact:
+
+"""
+    footer = f"""
+Provide analysis focused on {market_symbol} only. Determine relevance, impact, and trading implications.
+
+Output as JSON:
+{{
+    "is_relevant": true/false,
+    "event_description": "Brief explanation of the event and why it matters for {market_symbol}",
+    "analysis_text": "Concise analysis focused on {market_symbol} impact and trading implications",
+    "impact_score": 1-10,
+    "sentiment_summary": "bullish/bearish/neutral",
+    "key_factors": ["factor1", "factor2", "factor3"],
+    "expert_commentary": "Expert-level commentary on {market_symbol} market implications. Do a web search go get real time information on this"
+}}
+"""
+    return header, footer
+
 class LLMAnalyzer:
     # Class-level rate limiting to ensure it works across all instances
-    _last_api_call_time = 0
+    _next_request_slot = 0.0  # time.monotonic() value at which the next request may start
     _min_request_interval = 1.0  # Minimum 1.0 second between requests
     _rate_limit_lock = None  # Will be initialized when needed
+    _http_session = None  # Shared keep-alive HTTP session, created on first use
+    _max_concurrent_requests = 4  # LLM calls in flight per date, matches the HTTP pool size
     
     def __init__(self):
+        self.config = self._get_config()
         self.api_key = self._get_api_key()
         self.model = self._get_llm_model()
+        # New analyses are buffered and written in one commit per run
+        self._pending_analyses: List[EventAnalysis] = []
         # Initialize lock for thread safety if not already done
         if LLMAnalyzer._rate_limit_lock is None:
             import threading
             LLMAnalyzer._rate_limit_lock = threading.Lock()
         
+    @classmethod
+    def _get_http_session(cls) -> requests.Session:
+        """
+        Get the class-level HTTP session so the TCP/TLS connection to the API is reused across calls
+        """
+        if cls._http_session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=cls._max_concurrent_requests))
+            session.headers.update({'Content-Type': 'application/json'})
+            cls._http_session = session
+        return cls._http_session
+    
     def _enforce_rate_limit(self):
         """
         Enforce rate limiting to respect API subscription limits (1.0 second delay between requests)
         Uses class-level variables to ensure rate limiting works across all instances
+        
+        Each caller reserves the next free request slot under the lock and sleeps outside of it,
+        so concurrent callers queue up behind each other instead of serializing on the lock
         """
         with LLMAnalyzer._rate_limit_lock:
-            current_time = time.time()
-            time_since_last_call = current_time - LLMAnalyzer._last_api_call_time
-            
-            logger.info(f"Rate limiting check: {time_since_last_call:.2f}s since last call, need {LLMAnalyzer._min_request_interval}s")
-            
-            if time_since_last_call < LLMAnalyzer._min_request_interval:
-                sleep_time = LLMAnalyzer._min_request_interval - time_since_last_call
-                logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                logger.info(f"Rate limiting: sleep completed, proceeding with API call")
-            else:
-                logger.info(f"Rate limiting: no sleep needed, proceeding with API call")
-            
-            # Don't update last_api_call_time here - it will be updated after the actual API call
+            my_slot = max(LLMAnalyzer._next_request_slot, time.monotonic())
+            LLMAnalyzer._next_request_slot = my_slot + LLMAnalyzer._min_request_interval
         
-    def _get_api_key(self) -> Optional[str]:
+        sleep_time = my_slot - time.monotonic()
+        if sleep_time > 0:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Rate limiting: sleeping for %.2f seconds", sleep_time)
+            time.sleep(sleep_time)
+        else:
+            logger.debug("Rate limiting: no sleep needed, proceeding with API call")
+        
+    @staticmethod
+    def invalidate_config_cache():
         """
-        Get LLM API key from database config using ORM
+        Drop the cached config snapshot so the next analyzer picks up changed settings
         """
-        try:
-            session = get_db_session()
-            config = session.query(Config).order_by(Config.created_at.desc()).first()
-            session.close()
-            return config.llm_api_key if config else None
-        except Exception as e:
-            logger.error(f"Error getting API key: {e}")
-            return None
+        _load_config.cache_clear()
     
-    def _get_llm_model(self) -> str:
+    def _get_config(self) -> Dict:
         """
-        Get configured LLM model from database config using ORM
+        Get the cached config snapshot, falling back to defaults if the database is unavailable
         """
         try:
-            session = get_db_session()
-            config = session.query(Config).order_by(Config.created_at.desc()).first()
-            session.close()
-            return config.llm_model if config and config.llm_model else 'gpt-4o-mini'
+            return _load_config()
         except Exception as e:
-            logger.error(f"Error getting LLM model: {e}")
-            return 'gpt-4o-mini'  # Default fallback
+            logger.error(f"Error loading config: {e}")
+            return {'api_key': None, 'model': DEFAULT_LLM_MODEL, 'star_filter': 1}
     
-    def _get_star_filter(self) -> int:
+    def _get_api_key(self) -> Optional[str]:
         """
-        Get star filter setting from database config
+        Get LLM API key from the config snapshot
         """
-        try:
-            session = get_db_session()
-            config = session.query(Config).order_by(Config.created_at.desc()).first()
-            session.close()
-            
-            if config and config.star_filter:
-                return config.star_filter
-            else:
-                return 1  # Default to analyze all events
-                
-        except Exception as e:
-            logger.error(f"Error getting star filter: {e}")
-            return 1  # Default to analyze all events
+        return self.config['api_key']
     
-    def _get_event_importance(self, importance_str: str) -> int:
+    def _get_llm_model(self) -> str:
         """
-        Convert importance string to numeric value for filtering
+        Get configured LLM model from the config snapshot
         """
-        importance_map = {
-            'Low': 1,
-            'Medium': 2,
-            'High': 3
-        }
-        return importance_map.get(importance_str, 1)  # Default to Low if unknown
+        return self.config['model']
+    
+    def _get_star_filter(self) -> int:
+        """
+        Get star filter setting from the config snapshot
+        """
+        return self.config['star_filter']
     
     def analyze_economic_event(self, event_id: int, market_symbol: str) -> Optional[Dict]:
         """
         Analyze a single economic event using LLM for a specific market
+        
+        Thin wrapper that loads the event and its latest analysis, then delegates to analyze_economic_event_obj
         """
+        with SessionLocal() as session:
+            try:
+                event = session.query(EconomicEvent).filter(EconomicEvent.id == event_id).first()
+                if not event:
+                    logger.error(f"Event with ID {event_id} not found")
+                    return None
+                
+                # Check if analysis already exists for this event and market
+                existing_analysis = session.query(EventAnalysis).filter(
+                    EventAnalysis.event_id == event_id,
+                    EventAnalysis.market_symbol == market_symbol
+                ).order_by(EventAnalysis.created_at.desc()).first()
+                
+                # Check star filter - only analyze events with sufficient importance
+                star_filter = self._get_star_filter()
+                if not existing_analysis and event.importance_int < star_filter:
+                    logger.info(f"Event {event_id} importance ({event.importance_int}) below filter threshold ({star_filter}), skipping analysis")
+                    return None
+                
+                result = self.analyze_economic_event_obj(event, market_symbol, existing_analysis)
+                
+                # Single-event callers expect the analysis to be stored right away
+                saved_ids = self._save_pending_analyses(session)
+                if result and 'analysis_id' in result:
+                    result['analysis_id'] = saved_ids.get(event_id)
+                return result
+                
+            except Exception as e:
+                logger.error(f"Error analyzing event {event_id}: {e}")
+                return None
+    
+    def analyze_economic_event_obj(self, event: EconomicEvent, market_symbol: str,
+                                   existing_analysis: Optional[EventAnalysis] = None) -> Optional[Dict]:
+        """
+        Analyze an already loaded economic event for a specific market
+        
+        The star filter is applied by the callers when loading events. Does not touch the database (new analyses are only queued), so it is safe to run in worker threads
+        
+        Args:
+            event: EconomicEvent ORM object
+            market_symbol: Market symbol to analyze for
+            existing_analysis: Latest stored analysis for this event and market, if any
+        """
+        event_id = event.id
         try:
-            # Check if analysis already exists for this event and market
-            session = get_db_session()
-            existing_analysis = session.query(EventAnalysis).filter(
-                EventAnalysis.event_id == event_id,
-                EventAnalysis.market_symbol == market_symbol
-            ).order_by(EventAnalysis.created_at.desc()).first()
-            session.close()
-            
             if existing_analysis:
                 logger.info(f"Analysis already exists for event {event_id} and market {market_symbol}, skipping LLM analysis")
                 # Return existing analysis data
@@ -126,19 +223,7 @@ class LLMAnalyzer:
                     'expert_commentary': existing_analysis.expert_commentary or ''
                 }
             
-            # Get event details from database
-            event_data = self._get_event_data(event_id)
-            if not event_data:
-                logger.error(f"Event with ID {event_id} not found")
-                return None
-            
-            # Check star filter - only analyze events with sufficient importance
-            star_filter = self._get_star_filter()
-            event_importance = self._get_event_importance(event_data['importance'])
-            
-            if event_importance < star_filter:
-                logger.info(f"Event {event_id} importance ({event_importance}) below filter threshold ({star_filter}), skipping analysis")
-                return None
+            event_data = self._get_event_data(event)
             
             # Create analysis prompt with market context
             prompt = self._create_analysis_prompt(event_data, market_symbol)
@@ -157,11 +242,11 @@ class LLMAnalyzer:
                 logger.info(f"Event {event_id} not relevant for {market_symbol}, skipping analysis")
                 return None
             
-            # Save analysis to database
-            analysis_id = self._save_analysis_to_db(event_id, market_symbol, structured_analysis)
+            # Queue analysis for the batched save; the ID is filled in once it is written
+            self._queue_analysis(event_id, market_symbol, structured_analysis)
             
             return {
-                'analysis_id': analysis_id,
+                'analysis_id': None,
                 'event_id': event_id,
                 'analysis': structured_analysis
             }
@@ -170,35 +255,24 @@ class LLMAnalyzer:
             logger.error(f"Error analyzing event {event_id}: {e}")
             return None
     
-    def _get_event_data(self, event_id: int) -> Optional[Dict]:
+    def _get_event_data(self, event: EconomicEvent) -> Dict:
         """
-        Get event data from database using ORM
+        Convert a loaded EconomicEvent into the dict used for prompting and parsing
         """
-        try:
-            session = get_db_session()
-            event = session.query(EconomicEvent).filter(EconomicEvent.id == event_id).first()
-            session.close()
-            
-            if not event:
-                return None
-            
-            return {
-                'id': event.id,
-                'date': event.date,
-                'market_id': event.market_id,
-                'time': event.time,
-                'currency': event.currency,
-                'importance': event.importance,
-                'event_name': event.event_name,
-                'actual': event.actual,
-                'forecast': event.forecast,
-                'previous': event.previous,
-                'source_url': event.source_url,
-                'market_symbol': None  # Will be determined by LLM analysis
-            }
-        except Exception as e:
-            logger.error(f"Error getting event data: {e}")
-            return None
+        return {
+            'id': event.id,
+            'date': event.date,
+            'market_id': event.market_id,
+            'time': event.time,
+            'currency': event.currency,
+            'importance': event.importance,
+            'event_name': event.event_name,
+            'actual': event.actual,
+            'forecast': event.forecast,
+            'previous': event.previous,
+            'source_url': event.source_url,
+            'market_symbol': None  # Will be determined by LLM analysis
+        }
     
     def _search_expert_commentary(self, event_name: str, market_symbol: str) -> str:
         """
@@ -213,31 +287,16 @@ class LLMAnalyzer:
         """
         Create analysis prompt for LLM
         """
-        prompt = f"""
-Analyze this economic event for {market_symbol} market impact:
-
-Event: {event_data['event_name']}
+        header, footer = _prompt_template_for_market(market_symbol)
+        event_lines = f"""Event: {event_data['event_name']}
 Date: {event_data['date']}
 Time: {event_data['time']}
 Region (given by the currency): {event_data['currency']}
 Actual: {event_data['actual'] or 'Not released yet'}
 Forecast: {event_data['forecast'] or 'N/A'}
 Previous: {event_data['previous'] or 'N/A'}
-
-Provide analysis focused on {market_symbol} only. Determine relevance, impact, and trading implications.
-
-Output as JSON:
-{{
-    "is_relevant": true/false,
-    "event_description": "Brief explanation of the event and why it matters for {market_symbol}",
-    "analysis_text": "Concise analysis focused on {market_symbol} impact and trading implications",
-    "impact_score": 1-10,
-    "sentiment_summary": "bullish/bearish/neutral",
-    "key_factors": ["factor1", "factor2", "factor3"],
-    "expert_commentary": "Expert-level commentary on {market_symbol} market implications. Do a web search go get real time information on this"
-}}
 """
-        return prompt
+        return header + event_lines + footer
     
     def _call_llm_api(self, prompt: str) -> Optional[str]:
         """
@@ -253,10 +312,9 @@ Output as JSON:
         logger.info(f"Making API call to OpenAI at {time.time():.2f}")
         
         try:
-            # Using OpenAI API as default
+            # Using OpenAI API as default (Content-Type is set on the shared session)
             headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
+                'Authorization': f'Bearer {self.api_key}'
             }
             
             data = {
@@ -277,7 +335,7 @@ Output as JSON:
             
             logger.info(f"Using LLM model: {self.model}")
             
-            response = requests.post(
+            response = self._get_http_session().post(
                 'https://api.openai.com/v1/chat/completions',
                 headers=headers,
                 json=data,
@@ -285,11 +343,8 @@ Output as JSON:
             )
             
             response.raise_for_status()
-            result = response.json()
-            
-            # Update timestamp after successful API call (class-level)
-            LLMAnalyzer._last_api_call_time = time.time()
-            logger.info(f"API call successful, timestamp updated to {LLMAnalyzer._last_api_call_time:.2f}")
+            result = _json_loads(response.content)
+            logger.info("API call successful")
             
             return result['choices'][0]['message']['content']
             
@@ -307,20 +362,17 @@ Output as JSON:
         try:
             # Clean the response text - remove markdown code blocks
             cleaned_text = analysis_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]  # Remove ```json
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]  # Remove ```
-            cleaned_text = cleaned_text.strip()
+            fence_match = _FENCE_RE.match(cleaned_text)
+            if fence_match:
+                cleaned_text = fence_match.group(1)
             
             # Try to parse as JSON first
             if cleaned_text.startswith('{'):
-                parsed_json = json.loads(cleaned_text)
+                parsed_json = _json_loads(cleaned_text)
                 logger.info(f"Successfully parsed JSON analysis: {parsed_json.get('is_relevant', 'unknown')} relevance")
                 return parsed_json
             
             # Fallback: extract information from text
-            lines = analysis_text.split('\n')
             analysis = {
                 'event_description': 'Event description not available in this format.',
                 'analysis_text': analysis_text,
@@ -330,21 +382,20 @@ Output as JSON:
                 'expert_commentary': 'Expert commentary not available in this format.'
             }
             
+            text_lower = analysis_text.lower()
+            
             # Try to extract impact score
-            for line in lines:
-                if 'impact' in line.lower() and any(char.isdigit() for char in line):
-                    try:
-                        score = int(''.join(filter(str.isdigit, line)))
-                        if 1 <= score <= 10:
-                            analysis['impact_score'] = score
-                    except:
-                        pass
+            for score_text in _IMPACT_RE.findall(text_lower):
+                score = int(score_text)
+                if 1 <= score <= 10:
+                    analysis['impact_score'] = score
             
             # Try to extract sentiment
-            text_lower = analysis_text.lower()
-            if 'bullish' in text_lower:
+            sentiments = set(_SENTIMENT_RE.findall(text_lower))
+            
+            if 'bullish' in sentiments:
                 analysis['sentiment_summary'] = 'bullish'
-            elif 'bearish' in text_lower:
+            elif 'bearish' in sentiments:
                 analysis['sentiment_summary'] = 'bearish'
             
             return analysis
@@ -361,35 +412,46 @@ Output as JSON:
                 'expert_commentary': 'Expert commentary not available due to parsing error.'
             }
     
-    def _save_analysis_to_db(self, event_id: int, market_symbol: str, analysis: Dict) -> Optional[int]:
+    def _queue_analysis(self, event_id: int, market_symbol: str, analysis: Dict) -> EventAnalysis:
+        """
+        Buffer an analysis for the next batched save
+        """
+        event_analysis = EventAnalysis(
+            event_id=event_id,
+            market_symbol=market_symbol,
+            event_description=analysis.get('event_description', ''),
+            analysis_text=analysis['analysis_text'],
+            impact_score=analysis['impact_score'],
+            sentiment_summary=analysis['sentiment_summary'],
+            search_sources=analysis.get('key_factors', []),
+            expert_commentary=analysis.get('expert_commentary', '')
+        )
+        self._pending_analyses.append(event_analysis)
+        return event_analysis
+    
+    def _save_pending_analyses(self, session) -> Dict[int, int]:
         """
-        Save analysis to database using ORM
+        Save all buffered analyses to database in a single commit
+        
+        Returns:
+            Mapping of event_id to the ID of its saved analysis
         """
+        pending = self._pending_analyses
+        if not pending:
+            return {}
+        self._pending_analyses = []
+        
         try:
-            session = get_db_session()
-            
-            event_analysis = EventAnalysis(
-                event_id=event_id,
-                market_symbol=market_symbol,
-                event_description=analysis.get('event_description', ''),
-                analysis_text=analysis['analysis_text'],
-                impact_score=analysis['impact_score'],
-                sentiment_summary=analysis['sentiment_summary'],
-                search_sources=analysis.get('key_factors', []),
-                expert_commentary=analysis.get('expert_commentary', '')
-            )
-            
-            session.add(event_analysis)
+            session.add_all(pending)
             session.commit()
-            analysis_id = event_analysis.id
-            session.close()
             
-            logger.info(f"Saved analysis for event {event_id}")
-            return analysis_id
+            logger.info(f"Saved {len(pending)} analyses")
+            return {event_analysis.event_id: event_analysis.id for event_analysis in pending}
             
         except Exception as e:
-            logger.error(f"Error saving analysis: {e}")
-            return None
+            session.rollback()
+            logger.error(f"Error saving analyses: {e}")
+            return {}
     
     def analyze_events_for_date(self, target_date: date, market_symbol: str, progress_callback=None) -> List[Dict]:
         """
@@ -400,31 +462,65 @@ Output as JSON:
             market_symbol: Market symbol to analyze for
             progress_callback: Optional callback function(current, total, event_name) to report progress
         """
-        try:
-            # Get all events for the date (no market filtering at DB level)
-            session = get_db_session()
-            events = session.query(EconomicEvent).filter(EconomicEvent.date == target_date).all()
-            session.close()
-            
-            total_events = len(events)
-            
-            # Analyze each event for the specific market
-            analyses = []
-            for idx, event in enumerate(events, 1):
-                # Report progress before analyzing
-                if progress_callback:
-                    progress_callback(idx, total_events, event.event_name)
+        with SessionLocal() as session:
+            try:
+                # Get all events for the date together with any existing analysis for this market, in
+                # a single query (no market filtering of events at DB level). The star filter only
+                # applies to events still to be analyzed; existing analyses are returned regardless,
+                # as analyze_economic_event does
+                rows = session.query(EconomicEvent, EventAnalysis).outerjoin(
+                    EventAnalysis,
+                    and_(
+                        EventAnalysis.event_id == EconomicEvent.id,
+                        EventAnalysis.market_symbol == market_symbol
+                    )
+                ).filter(
+                    EconomicEvent.date == target_date,
+                    or_(
+                        EconomicEvent.importance_int >= self._get_star_filter(),
+                        EventAnalysis.id.isnot(None)
+                    )
+                ).order_by(EconomicEvent.id, EventAnalysis.created_at.desc()).all()
                 
-                analysis = self.analyze_economic_event(event.id, market_symbol)
-                if analysis:
-                    analyses.append(analysis)
-            
-            logger.info(f"Analyzed {len(analyses)} relevant events for {market_symbol} on {target_date}")
-            return analyses
-            
-        except Exception as e:
-            logger.error(f"Error analyzing events for date: {e}")
-            return []
+                # Keep only the latest analysis per event
+                events = {}
+                for event, existing_analysis in rows:
+                    if event.id not in events:
+                        events[event.id] = (event, existing_analysis)
+                
+                total_events = len(events)
+                
+                # Analyze the events concurrently so API latency overlaps; the shared rate limit
+                # still spaces out the requests
+                results = {}
+                with ThreadPoolExecutor(max_workers=LLMAnalyzer._max_concurrent_requests) as executor:
+                    futures = {
+                        executor.submit(self.analyze_economic_event_obj, event, market_symbol, existing_analysis): event
+                        for event, existing_analysis in events.values()
+                    }
+                    for idx, future in enumerate(as_completed(futures), 1):
+                        event = futures[future]
+                        results[event.id] = future.result()
+                        
+                        # Report progress as events finish
+                        if progress_callback:
+                            progress_callback(idx, total_events, event.event_name)
+                
+                # Keep the results in event order
+                analyses = [results[event_id] for event_id in events if results[event_id]]
+                
+                # Write all new analyses for this date at once
+                saved_ids = self._save_pending_analyses(session)
+                for analysis in analyses:
+                    if 'analysis_id' in analysis:
+                        analysis['analysis_id'] = saved_ids.get(analysis['event_id'])
+                
+                logger.info(f"Analyzed {len(analyses)} relevant events for {market_symbol} on {target_date}")
+                return analyses
+                
+            except Exception as e:
+                logger.error(f"Error analyzing events for date: {e}")
+                return []
 
 def analyze_economic_events(target_date: date = None, market_symbol: str = "FDAX", progress_callback=None) -> List[Dict]:
     """
@@ -441,6 +537,16 @@ def analyze_economic_events(target_date: date = None, market_symbol: str = "FDAX
     analyzer = LLMAnalyzer()
     return analyzer.analyze_events_for_date(target_date, market_symbol, progress_callback)
 
+def get_star_filter() -> int:
+    """
+    Get the configured star filter (minimum importance of events that get a new analysis)
+    """
+    try:
+        return _load_config()['star_filter']
+    except Exception as e:
+        logger.error(f"Error loading config: {e}")
+        return 1
+
 if __name__ == "__main__":
     # Test the analyzer
     print("Testing LLM Analyzer...")
@@ -1,12 +1,37 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Date, Time, ForeignKey, JSON
+from sqlalchemy import create_engine, event, func, literal_column, Column, Index, Integer, String, Text, DateTime, Date, Time, ForeignKey, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.schema import CreateIndex
 from datetime import datetime, date, time
 from pathlib import Path
+import gzip
+import json
 import os
 
+# orjson is optional - it (de)serializes the JSON columns in C, the stdlib json module is the fallback
+try:
+    import orjson
+    _json_serializer = lambda value: orjson.dumps(value).decode('utf-8')
+    _json_deserializer = orjson.loads
+except ImportError:
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
 Base = declarative_base()
 
+# Natural key of a scraped event. All-day events have no time and SQLite treats NULLs as distinct
+# in unique indexes, so the key uses coalesce(time, ''); the literal (not a bound parameter) keeps
+# the expression identical between the index DDL and INSERT ... ON CONFLICT targets.
+def _event_natural_key(date_col, event_name_col, time_col):
+    return (date_col, event_name_col, func.coalesce(time_col, literal_column("''")))
+
+# Numeric importance levels, matching the star filter in Config (1=Low, 2=Medium, 3=High)
+IMPORTANCE_LEVELS = {'Low': 1, 'Medium': 2, 'High': 3}
+
+def _default_importance_int(context):
+    """Derive the numeric importance from the importance string when it isn't set explicitly"""
+    return IMPORTANCE_LEVELS.get(context.get_current_parameters().get('importance'), 1)
+
 class Market(Base):
     __tablename__ = 'markets'
     
@@ -14,11 +39,12 @@ class Market(Base):
     symbol = Column(String(20), unique=True, nullable=False)
     description = Column(Text)
     
-    # Relationships
-    economic_events = relationship("EconomicEvent", back_populates="market")
-    news_items = relationship("NewsItem", back_populates="market")
-    chart_analyses = relationship("ChartAnalysis", back_populates="market")
-    reports = relationship("Report", back_populates="market")
+    # Relationships - lazy="raise_on_sql" turns accidental lazy loads (N+1 queries) into errors;
+    # load them explicitly with joinedload/selectinload/contains_eager where they are needed
+    economic_events = relationship("EconomicEvent", back_populates="market", lazy="raise_on_sql")
+    news_items = relationship("NewsItem", back_populates="market", lazy="raise_on_sql")
+    chart_analyses = relationship("ChartAnalysis", back_populates="market", lazy="raise_on_sql")
+    reports = relationship("Report", back_populates="market", lazy="raise_on_sql")
 
 class Config(Base):
     __tablename__ = 'config'
@@ -41,6 +67,7 @@ class EconomicEvent(Base):
     time = Column(Time)
     currency = Column(String(10))
     importance = Column(String(10))  # Low, Medium, High
+    importance_int = Column(Integer, default=_default_importance_int, index=True)  # 1-3, see IMPORTANCE_LEVELS
     event_name = Column(Text, nullable=False)
     actual = Column(Text)
     forecast = Column(Text)
@@ -48,8 +75,20 @@ class EconomicEvent(Base):
     source_url = Column(Text)
     
     # Relationships
-    market = relationship("Market", back_populates="economic_events")
-    analyses = relationship("EventAnalysis", back_populates="event")
+    market = relationship("Market", back_populates="economic_events", lazy="raise_on_sql")
+    analyses = relationship("EventAnalysis", back_populates="event", lazy="raise_on_sql")
+    
+    __table_args__ = (
+        # Events are always looked up per date and listed by time and importance
+        Index('ix_econ_date_time_imp', date, time, importance_int),
+        # One row per scraped event, the conflict target of the scraper's upsert
+        Index('uq_econ_date_name_time', *_event_natural_key(date, event_name, time), unique=True),
+    )
+    
+    @classmethod
+    def natural_key(cls):
+        """Columns/expressions of the unique (date, event_name, time) key, for ON CONFLICT clauses"""
+        return _event_natural_key(cls.date, cls.event_name, cls.time)
 
 class EventAnalysis(Base):
     __tablename__ = 'event_analyses'
@@ -66,7 +105,12 @@ class EventAnalysis(Base):
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
-    event = relationship("EconomicEvent", back_populates="analyses")
+    event = relationship("EconomicEvent", back_populates="analyses", lazy="raise_on_sql")
+    
+    __table_args__ = (
+        # Serves the "latest analysis for this event and market" lookup
+        Index('ix_ea_event_market_created', event_id, market_symbol, created_at.desc()),
+    )
 
 class NewsItem(Base):
     __tablename__ = 'news_items'
@@ -80,8 +124,12 @@ class NewsItem(Base):
     source = Column(String(100))
     
     # Relationships
-    market = relationship("Market", back_populates="news_items")
-    analyses = relationship("NewsAnalysis", back_populates="news_item")
+    market = relationship("Market", back_populates="news_items", lazy="raise_on_sql")
+    analyses = relationship("NewsAnalysis", back_populates="news_item", lazy="raise_on_sql")
+    
+    __table_args__ = (
+        Index('ix_news_date_market', date, market_id),
+    )
 
 class NewsAnalysis(Base):
     __tablename__ = 'news_analyses'
@@ -94,7 +142,7 @@ class NewsAnalysis(Base):
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
-    news_item = relationship("NewsItem", back_populates="analyses")
+    news_item = relationship("NewsItem", back_populates="analyses", lazy="raise_on_sql")
 
 class ChartAnalysis(Base):
     __tablename__ = 'chart_analyses'
@@ -109,7 +157,7 @@ class ChartAnalysis(Base):
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
-    market = relationship("Market", back_populates="chart_analyses")
+    market = relationship("Market", back_populates="chart_analyses", lazy="raise_on_sql")
 
 class Report(Base):
     __tablename__ = 'reports'
@@ -117,12 +165,40 @@ class Report(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date, nullable=False)
     market_id = Column(Integer, ForeignKey('markets.id'))
-    report_html = Column(Text)
+    # Gzip-compressed HTML, stored in the existing report_html column; use the report_html property
+    report_html_gz = Column('report_html', LargeBinary)
+    content_hash = Column(String(64), index=True)  # Fingerprint of the analyses the report was built from
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
-    market = relationship("Market", back_populates="reports")
-    postmortems = relationship("Postmortem", back_populates="report")
+    market = relationship("Market", back_populates="reports", lazy="raise_on_sql")
+    postmortems = relationship("Postmortem", back_populates="report", lazy="raise_on_sql")
+    
+    @property
+    def report_html(self):
+        """Report HTML, decompressed on access"""
+        data = self.report_html_gz
+        if not data:
+            return None
+        if isinstance(data, str):
+            # Reports saved before compression was introduced are plain text
+            return data
+        return gzip.decompress(data).decode('utf-8')
+    
+    @report_html.setter
+    def report_html(self, value):
+        self.report_html_gz = Report.compress_html(value)
+    
+    @staticmethod
+    def compress_html(html):
+        """Compress report HTML for the report_html_gz column (for Core inserts/updates)"""
+        return gzip.compress(html.encode('utf-8'), compresslevel=6) if html else None
+    
+    __table_args__ = (
+        Index('ix_report_date_market', date, market_id),
+        # Report list filtered by market, in its date/created_at order
+        Index('ix_report_market_date_created', market_id, date, created_at),
+    )
 
 class Postmortem(Base):
     __tablename__ = 'postmortems'
@@ -133,29 +209,151 @@ class Postmortem(Base):
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
-    report = relationship("Report", back_populates="postmortems")
+    report = relationship("Report", back_populates="postmortems", lazy="raise_on_sql")
 
 # Database setup
+# Database location, resolved once at import; FOMO_BOT_DB points the app at another database file
+_DB_PATH = Path(os.environ.get(
+    "FOMO_BOT_DB",
+    Path(__file__).resolve().parents[2] / "database" / "fomo-bot-DB.sqlite"
+))
+_DB_URL = f"sqlite:///{_DB_PATH}"
+
+def get_database_path():
+    """Get the path of the SQLite database file"""
+    return _DB_PATH
+
 def get_database_url():
     """Get database URL based on environment"""
-    # Get the project root directory (two levels up from backend)
-    project_root = Path(__file__).parent.parent.parent
-    db_path = project_root / "database" / "fomo-bot-DB.sqlite"
-    return f"sqlite:///{db_path}"
+    return _DB_URL
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLite performance PRAGMAs to every new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")  # No rollback-journal write amplification
+    cursor.execute("PRAGMA synchronous=NORMAL")  # WAL is still safe without a full fsync per commit
+    cursor.execute("PRAGMA wal_autocheckpoint=1000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+    cursor.close()
 
 def create_engine_and_session():
     """Create SQLAlchemy engine and session"""
-    engine = create_engine(get_database_url(), echo=False)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # SQLAlchemy's default QueuePool keeps the SQLite connections (and their WAL/SHM mappings) open
+    # between checkouts; connections may be checked out by Flask and background worker threads alike
+    engine = create_engine(
+        get_database_url(),
+        echo=False,
+        connect_args={"check_same_thread": False, "timeout": 30},
+        # Used for the JSON columns (EventAnalysis.search_sources, ChartAnalysis.scenarios)
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
     return engine, SessionLocal
 
+# Shared engine and session factory, built once so every session reuses the engine's connection pool
+_ENGINE, SessionLocal = create_engine_and_session()
+
 def get_db_session():
     """Get database session"""
-    _, SessionLocal = create_engine_and_session()
     return SessionLocal()
 
+def get_db_connection():
+    """Get a pooled database connection for plain SQL/Core statements that need no ORM session"""
+    return _ENGINE.connect()
+
+# Columns added to existing tables since their first release, as (table, column, DDL type, backfill
+# statement or None); create_all only creates missing tables, so init_database adds these itself
+_ADDED_COLUMNS = [
+    ('economic_events', 'importance_int', 'INTEGER',
+     "UPDATE economic_events SET importance_int = CASE importance "
+     + " ".join(f"WHEN '{name}' THEN {level}" for name, level in IMPORTANCE_LEVELS.items())
+     + " ELSE 1 END"),
+    # Older reports have no fingerprint and are simply never reused
+    ('reports', 'content_hash', 'VARCHAR(64)', None),
+]
+
+def _add_missing_columns(connection):
+    """Add the columns in _ADDED_COLUMNS that a database created by an older version lacks"""
+    for table, column, column_type, backfill in _ADDED_COLUMNS:
+        existing_columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if column in existing_columns:
+            continue
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        if backfill:
+            connection.exec_driver_sql(backfill)
+
+def _merge_duplicate_events(connection):
+    """
+    Collapse events that share the (date, event_name, time) natural key before its unique index is
+    created; older versions could store the same event twice. The row with the lowest id is kept
+    and the analyses of the removed rows are moved over to it
+    """
+    index_exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'uq_econ_date_name_time'"
+    ).first()
+    if index_exists:
+        return
+    
+    connection.exec_driver_sql("""
+        CREATE TEMP TABLE duplicate_events AS
+        SELECT e.id AS duplicate_id, k.keep_id
+        FROM economic_events AS e
+        JOIN (
+            SELECT date, event_name, coalesce(time, '') AS event_time, MIN(id) AS keep_id
+            FROM economic_events
+            GROUP BY date, event_name, coalesce(time, '')
+            HAVING COUNT(*) > 1
+        ) AS k ON e.date = k.date AND e.event_name = k.event_name
+              AND coalesce(e.time, '') = k.event_time AND e.id <> k.keep_id
+    """)
+    connection.exec_driver_sql("""
+        UPDATE event_analyses
+        SET event_id = (SELECT keep_id FROM duplicate_events WHERE duplicate_id = event_analyses.event_id)
+        WHERE event_id IN (SELECT duplicate_id FROM duplicate_events)
+    """)
+    connection.exec_driver_sql("DELETE FROM economic_events WHERE id IN (SELECT duplicate_id FROM duplicate_events)")
+    connection.exec_driver_sql("DROP TABLE duplicate_events")
+
 def init_database():
     """Initialize database with all tables"""
-    engine, _ = create_engine_and_session()
-    Base.metadata.create_all(bind=engine)
+    engine = _ENGINE
+    # A new database holds no data yet, so if setup is interrupted init_db can simply be rerun;
+    # an existing one is migrated in place and keeps its WAL journal to roll back a failed setup
+    new_database = not _DB_PATH.exists() or _DB_PATH.stat().st_size == 0
+    with engine.connect() as connection:
+        # Skip journaling and fsyncs for the DDL phase of a new database; FK checks are off for
+        # the schema changes either way
+        if new_database:
+            connection.exec_driver_sql("PRAGMA journal_mode=OFF")
+            connection.exec_driver_sql("PRAGMA synchronous=OFF")
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        
+        # Create all tables in one explicit transaction - a single commit instead of one per DDL
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        Base.metadata.create_all(bind=connection)
+        _add_missing_columns(connection)
+        _merge_duplicate_events(connection)
+        
+        # create_all skips tables that already exist, so add indexes introduced since then separately
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                # IF NOT EXISTS rather than checkfirst: reflection can't see expression indexes
+                connection.execute(CreateIndex(index, if_not_exists=True))
+        connection.commit()
+        
+        # Give the query planner statistics for the new tables and indexes from day one
+        connection.exec_driver_sql("PRAGMA analysis_limit=400")
+        connection.exec_driver_sql("ANALYZE")
+        connection.exec_driver_sql("PRAGMA optimize")
+        
+        # Restore the regular connection settings
+        if new_database:
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+            connection.exec_driver_sql("PRAGMA synchronous=NORMAL")
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
     return engine
@@ -1,378 +1,260 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import functools
+import hashlib
+import json
 import logging
-from models import get_db_session, Market, EconomicEvent, EventAnalysis, Report
+import re
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+from sqlalchemy import and_, distinct, func, insert, select
+from sqlalchemy.orm import joinedload
+from models import SessionLocal, Market, EconomicEvent, EventAnalysis, Report
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ReportGenerator:
-    def __init__(self):
-        pass
-    
-    def generate_economic_calendar_report(self, target_date: date, market_symbol: str) -> Optional[Dict]:
-        """
-        Generate HTML report for economic calendar analysis
-        """
-        try:
-            # Get market information
-            market_data = self._get_market_data(market_symbol)
-            if not market_data:
-                logger.error(f"Market {market_symbol} not found")
-                return None
-            
-            # Get events and analyses for the date
-            events_data = self._get_events_with_analyses(target_date, market_symbol)
-            
-            # Generate HTML report
-            html_content = self._create_html_report(target_date, market_data, events_data)
-            
-            # Save report to database
-            report_id = self._save_report_to_db(target_date, market_data['id'], html_content)
-            
-            return {
-                'report_id': report_id,
-                'date': target_date,
-                'market_symbol': market_symbol,
-                'html_content': html_content,
-                'events_count': len(events_data)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error generating report: {e}")
-            return None
-    
-    def _get_market_data(self, market_symbol: str) -> Optional[Dict]:
-        """
-        Get market data from database using ORM
-        """
-        try:
-            session = get_db_session()
-            market = session.query(Market).filter(Market.symbol == market_symbol).first()
-            session.close()
-            
-            if not market:
-                return None
-            
-            return {
-                'id': market.id,
-                'symbol': market.symbol,
-                'description': market.description
-            }
-        except Exception as e:
-            logger.error(f"Error getting market data: {e}")
-            return None
-    
-    def _get_events_with_analyses(self, target_date: date, market_symbol: str) -> List[Dict]:
-        """
-        Get events with their analyses for a specific date and market using ORM
-        """
-        try:
-            session = get_db_session()
-            
-            # Get all events for the date (no market filtering at DB level)
-            events = session.query(EconomicEvent).filter(
-                EconomicEvent.date == target_date
-            ).order_by(EconomicEvent.time.asc(), EconomicEvent.importance.desc()).all()
-            
-            events_data = []
-            for event in events:
-                # Get the latest analysis for this event and market
-                analysis = session.query(EventAnalysis).filter(
-                    EventAnalysis.event_id == event.id,
-                    EventAnalysis.market_symbol == market_symbol
-                ).order_by(EventAnalysis.created_at.desc()).first()
-                
-                # Only include events that have been analyzed (relevant for this market)
-                if analysis:
-                    events_data.append({
-                        'id': event.id,
-                        'time': event.time,
-                        'currency': event.currency,
-                        'importance': event.importance,
-                        'event_name': event.event_name,
-                        'actual': event.actual,
-                        'forecast': event.forecast,
-                        'previous': event.previous,
-                        'source_url': event.source_url,
-                        'event_description': analysis.event_description,
-                        'analysis_text': analysis.analysis_text,
-                        'impact_score': analysis.impact_score,
-                        'sentiment_summary': analysis.sentiment_summary,
-                        'search_sources': analysis.search_sources,
-                        'expert_commentary': analysis.expert_commentary,
-                        'analysis_created_at': analysis.created_at
-                    })
-            
-            session.close()
-            return events_data
-            
-        except Exception as e:
-            logger.error(f"Error getting events with analyses: {e}")
-            return []
-    
-    
-    def _create_html_report(self, target_date: date, market_data: Dict, events_data: List[Dict]) -> str:
-        """
-        Create HTML report content
-        """
-        # Calculate summary statistics
-        total_events = len(events_data)
-        high_impact_events = len([e for e in events_data if e['importance'] == 'High'])
-        analyzed_events = len([e for e in events_data if e['analysis_text']])
-        
-        # Get sentiment distribution
-        sentiments = [e['sentiment_summary'] for e in events_data if e['sentiment_summary']]
-        sentiment_counts = {
-            'bullish': sentiments.count('bullish'),
-            'bearish': sentiments.count('bearish'),
-            'neutral': sentiments.count('neutral')
-        }
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>FOMO Bot Report - {market_data['symbol']} - {target_date}</title>
-    <style>
-        body {{
+# Static report stylesheet, kept out of the template so it is not re-emitted through the renderer
+_REPORT_CSS = Markup("""
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
             color: #333;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0;
             font-size: 2.5em;
             font-weight: 300;
-        }}
-        .header .subtitle {{
+        }
+        .header .subtitle {
             margin: 10px 0 0 0;
             font-size: 1.2em;
             opacity: 0.9;
-        }}
-        .summary {{
+        }
+        .summary {
             padding: 30px;
             background: #f8f9fa;
             border-bottom: 1px solid #dee2e6;
-        }}
-        .summary-grid {{
+        }
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
-        .summary-card {{
+        }
+        .summary-card {
             background: white;
             padding: 20px;
             border-radius: 6px;
             text-align: center;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .summary-card h3 {{
+        }
+        .summary-card h3 {
             margin: 0 0 10px 0;
             color: #667eea;
             font-size: 2em;
-        }}
-        .summary-card p {{
+        }
+        .summary-card p {
             margin: 0;
             color: #666;
             font-size: 0.9em;
-        }}
-        .events-section {{
+        }
+        .events-section {
             padding: 30px;
-        }}
-        .events-section h2 {{
+        }
+        .events-section h2 {
             color: #333;
             border-bottom: 2px solid #667eea;
             padding-bottom: 10px;
             margin-bottom: 30px;
-        }}
-        .event-card {{
+        }
+        .event-card {
             background: white;
             border: 1px solid #dee2e6;
             border-radius: 8px;
             margin-bottom: 20px;
             overflow: hidden;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .event-header {{
+        }
+        .event-header {
             background: #f8f9fa;
             padding: 15px 20px;
             border-bottom: 1px solid #dee2e6;
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        .event-time-container {{
+        }
+        .event-time-container {
             display: flex;
             flex-direction: column;
             align-items: flex-start;
-        }}
-        .time-label {{
+        }
+        .time-label {
             font-size: 0.8em;
             color: #666;
             margin-bottom: 2px;
             font-weight: 500;
-        }}
-        .event-time {{
+        }
+        .event-time {
             font-weight: bold;
             color: #667eea;
-        }}
-        .importance-container {{
+        }
+        .importance-container {
             display: flex;
             flex-direction: column;
             align-items: flex-end;
-        }}
-        .importance-label {{
+        }
+        .importance-label {
             font-size: 0.8em;
             color: #666;
             margin-bottom: 2px;
             font-weight: 500;
-        }}
-        .importance-badge {{
+        }
+        .importance-badge {
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 0.8em;
             font-weight: bold;
             text-transform: uppercase;
-        }}
-        .importance-high {{
+        }
+        .importance-high {
             background: #dc3545;
             color: white;
-        }}
-        .importance-medium {{
+        }
+        .importance-medium {
             background: #ffc107;
             color: #333;
-        }}
-        .importance-low {{
+        }
+        .importance-low {
             background: #28a745;
             color: white;
-        }}
-        .event-content {{
+        }
+        .event-content {
             padding: 20px;
-        }}
-        .event-title {{
+        }
+        .event-title {
             font-size: 1.2em;
             font-weight: bold;
             margin-bottom: 10px;
             color: #333;
-        }}
-        .event-details {{
+        }
+        .event-details {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 15px;
             margin-bottom: 15px;
-        }}
-        .detail-item {{
+        }
+        .detail-item {
             background: #f8f9fa;
             padding: 10px;
             border-radius: 4px;
-        }}
-        .detail-label {{
+        }
+        .detail-label {
             font-size: 0.8em;
             color: #666;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
-        .detail-value {{
+        }
+        .detail-value {
             font-weight: bold;
             color: #333;
-        }}
-        .analysis {{
+        }
+        .analysis {
             background: #e3f2fd;
             border-left: 4px solid #2196f3;
             padding: 15px;
             margin-top: 15px;
             border-radius: 0 4px 4px 0;
-        }}
-        .analysis h4 {{
+        }
+        .analysis h4 {
             margin: 0 0 10px 0;
             color: #1976d2;
-        }}
-        .analysis-metrics {{
+        }
+        .analysis-metrics {
             display: flex;
             gap: 20px;
             margin-bottom: 15px;
             flex-wrap: wrap;
-        }}
-        .metric-item {{
+        }
+        .metric-item {
             display: flex;
             flex-direction: column;
             gap: 5px;
             min-width: 150px;
-        }}
-        .metric-label {{
+        }
+        .metric-label {
             font-size: 0.9em;
             color: #666;
             font-weight: 500;
-        }}
-        .analysis-content {{
+        }
+        .analysis-content {
             margin-top: 10px;
-        }}
-        .expert-commentary {{
+        }
+        .expert-commentary {
             background: #f3e5f5;
             border-left: 4px solid #9c27b0;
             padding: 15px;
             margin-top: 15px;
             border-radius: 0 4px 4px 0;
-        }}
-        .expert-commentary h4 {{
+        }
+        .expert-commentary h4 {
             margin: 0 0 10px 0;
             color: #7b1fa2;
-        }}
-        .commentary-content {{
+        }
+        .commentary-content {
             margin-top: 10px;
-        }}
-        .key-factors {{
+        }
+        .key-factors {
             margin-top: 10px;
             padding: 10px;
             background: #e9ecef;
             border-radius: 3px;
-        }}
-        .key-factors ul {{
+        }
+        .key-factors ul {
             margin: 5px 0 0 0;
             padding-left: 20px;
-        }}
-        .key-factors li {{
+        }
+        .key-factors li {
             margin-bottom: 3px;
-        }}
-        .event-description {{
+        }
+        .event-description {
             background: #f0f8ff;
             border-left: 4px solid #2196f3;
             padding: 15px;
             margin-top: 15px;
             border-radius: 0 4px 4px 0;
-        }}
-        .event-description h4 {{
+        }
+        .event-description h4 {
             margin: 0 0 10px 0;
             color: #1976d2;
             font-size: 1em;
-        }}
-        .event-description p {{
+        }
+        .event-description p {
             margin: 0;
             color: #333;
             line-height: 1.5;
-        }}
-        .impact-score {{
+        }
+        .impact-score {
             display: inline-block;
             color: white;
             padding: 6px 12px;
@@ -381,17 +263,17 @@ class ReportGenerator:
             font-weight: bold;
             text-align: center;
             min-width: 80px;
-        }}
-        .impact-low {{
+        }
+        .impact-low {
             background: #4caf50;
-        }}
-        .impact-medium {{
+        }
+        .impact-medium {
             background: #ff9800;
-        }}
-        .impact-high {{
+        }
+        .impact-high {
             background: #f44336;
-        }}
-        .sentiment {{
+        }
+        .sentiment {
             display: inline-block;
             padding: 6px 12px;
             border-radius: 15px;
@@ -399,232 +281,332 @@ class ReportGenerator:
             font-weight: bold;
             text-align: center;
             min-width: 80px;
-        }}
-        .sentiment-bullish {{
+        }
+        .sentiment-bullish {
             background: #4caf50;
             color: white;
-        }}
-        .sentiment-bearish {{
+        }
+        .sentiment-bearish {
             background: #f44336;
             color: white;
-        }}
-        .sentiment-neutral {{
+        }
+        .sentiment-neutral {
             background: #9e9e9e;
             color: white;
-        }}
-        .footer {{
+        }
+        .footer {
             background: #333;
             color: white;
             padding: 20px;
             text-align: center;
             font-size: 0.9em;
-        }}
-        .no-events {{
+        }
+        .no-events {
             text-align: center;
             padding: 40px;
             color: #666;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>FOMO Bot Report</h1>
-            <div class="subtitle">{market_data['symbol']} - {target_date.strftime('%d.%m.%Y')}</div>
-        </div>
-        
-        <div class="summary">
-            <h2>Summary</h2>
-            <div class="summary-grid">
-                <div class="summary-card">
-                    <h3>{total_events}</h3>
-                    <p>Total Events</p>
-                </div>
-                <div class="summary-card">
-                    <h3>{high_impact_events}</h3>
-                    <p>High Impact</p>
-                </div>
-                <div class="summary-card">
-                    <h3>{analyzed_events}</h3>
-                    <p>Analysiert</p>
-                </div>
-                <div class="summary-card">
-                    <h3>{sentiment_counts['bullish']}/{sentiment_counts['bearish']}/{sentiment_counts['neutral']}</h3>
-                    <p>Bullish/Bearish/Neutral</p>
-                </div>
-            </div>
-        </div>
-        
-        <div class="events-section">
-            <h2>Economic Calendar Events</h2>
-"""
+        }
+""".strip("\n"))
+
+# Report template, compiled once at import; autoescaping keeps scraped and LLM text from injecting markup
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=select_autoescape(["html", "j2"]),
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+_TEMPLATE_ENV.globals['report_css'] = _REPORT_CSS
+_REPORT_TEMPLATE = _TEMPLATE_ENV.get_template("report.html.j2")
+
+# Matches text whose first non-whitespace character opens a JSON object, without copying the text
+_JSON_OBJECT_RE = re.compile(r"\s*\{")
+
+_SENTIMENT_DESCRIPTIONS = {
+    'bullish': 'Positive - Expectation of rising prices',
+    'bearish': 'Negative - Expectation of falling prices',
+    'neutral': 'Neutral - No clear direction'
+}
+
+# (highest impact score, level, description), checked in order
+_IMPACT_LEVELS = (
+    (3, 'Low', 'Low impact on the market'),
+    (6, 'Medium', 'Moderate impact on the market'),
+    (10, 'High', 'Strong impact on the market')
+)
+
+def _impact_level(impact_score: int) -> Tuple[str, str]:
+    """
+    Map an impact score (1-10) to its level name and description
+    """
+    for upper_bound, level, description in _IMPACT_LEVELS:
+        if impact_score <= upper_bound:
+            return level, description
+    return _IMPACT_LEVELS[-1][1], _IMPACT_LEVELS[-1][2]
+
+@functools.lru_cache(maxsize=64)
+def _load_market(market_symbol: str) -> Optional[Dict]:
+    """
+    Look up a market by symbol once; markets only change through the config page
+    """
+    with SessionLocal() as session:
+        market = session.scalar(select(Market).where(Market.symbol == market_symbol))
+        if not market:
+            return None
         
-        if not events_data:
-            html += """
-            <div class="no-events">
-                <h3>No Events Found</h3>
-                <p>No economic events were found for this day.</p>
-            </div>
-"""
-        else:
-            for event in events_data:
-                importance_class = f"importance-{event['importance'].lower()}"
-                sentiment_class = f"sentiment-{event['sentiment_summary']}" if event['sentiment_summary'] else "sentiment-neutral"
+        return {
+            'id': market.id,
+            'symbol': market.symbol,
+            'description': market.description
+        }
+
+class ReportGenerator:
+    def __init__(self):
+        pass
+    
+    @staticmethod
+    def invalidate_market_cache():
+        """
+        Drop the cached market lookups after markets were added, changed or deleted
+        """
+        _load_market.cache_clear()
+    
+    def generate_economic_calendar_report(self, target_date: date, market_symbol: str) -> Optional[Dict]:
+        """
+        Generate HTML report for economic calendar analysis
+        """
+        try:
+            # One session (and pooled connection) for the whole report; SessionLocal.begin()
+            # wraps it in a single transaction that is committed once when the block exits
+            with SessionLocal.begin() as session:
+                # Get market information
+                market_data = self._get_market_data(market_symbol)
+                if not market_data:
+                    logger.error(f"Market {market_symbol} not found")
+                    return None
                 
-                html += f"""
-            <div class="event-card">
-                <div class="event-header">
-                    <div class="event-time-container">
-                        <div class="time-label">🕐 Time</div>
-                        <div class="event-time">{event['time'] or 'All Day'}</div>
-                    </div>
-                    <div class="importance-container">
-                        <div class="importance-label">📊 Importance</div>
-                        <div class="importance-badge {importance_class}">{event['importance']}</div>
-                    </div>
-                </div>
-                <div class="event-content">
-                    <div class="event-title">{event['event_name']}</div>
-                    <div class="event-details">
-                        <div class="detail-item">
-                            <div class="detail-label">Currency</div>
-                            <div class="detail-value">{event['currency']}</div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Actual</div>
-                            <div class="detail-value">{event['actual'] or 'N/A'}</div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Forecast</div>
-                            <div class="detail-value">{event['forecast'] or 'N/A'}</div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Previous</div>
-                            <div class="detail-value">{event['previous'] or 'N/A'}</div>
-                        </div>
-                    </div>
-"""
+                # Reuse an existing report if none of its analyses changed since it was generated; only
+                # one that belongs to this market row (a deleted and re-added market starts afresh)
+                content_hash, analyzed_count = self._get_content_hash(session, target_date, market_symbol)
+                existing_report = session.scalar(select(Report).where(
+                    Report.content_hash == content_hash,
+                    Report.market_id == market_data['id'],
+                    Report.date == target_date
+                ).limit(1))
+                if existing_report:
+                    logger.info(f"Reusing report {existing_report.id} for {market_symbol} on {target_date}")
+                    return {
+                        'report_id': existing_report.id,
+                        'date': target_date,
+                        'market_symbol': market_symbol,
+                        'html_content': existing_report.report_html,
+                        'events_count': analyzed_count
+                    }
+                
+                # Get events and analyses for the date
+                events_data = self._get_events_with_analyses(session, target_date, market_symbol)
                 
-                # Add event description section before analysis
-                if event.get('event_description') and event['event_description'].strip():
-                    html += f"""
-                    <div class="event-description">
-                        <h4>📋 Event Description</h4>
-                        <p>{event['event_description']}</p>
-                    </div>
-"""
+                # Generate HTML report
+                html_content = self._create_html_report(target_date, market_data, events_data)
                 
-                if event['analysis_text']:
-                    # Try to parse analysis_text as JSON, if it fails, use as plain text
-                    analysis_display = event['analysis_text']
+                # Save report to database
+                report_id = self._save_report_to_db(session, target_date, market_data['id'], html_content, content_hash)
+            
+            return {
+                'report_id': report_id,
+                'date': target_date,
+                'market_symbol': market_symbol,
+                'html_content': html_content,
+                'events_count': len(events_data)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error generating report: {e}")
+            return None
+    
+    def _get_market_data(self, market_symbol: str) -> Optional[Dict]:
+        """
+        Get market data from the cached market lookup
+        """
+        try:
+            market_data = _load_market(market_symbol)
+            # Hand out a copy so callers cannot modify the cached entry
+            return dict(market_data) if market_data else None
+        except Exception as e:
+            logger.error(f"Error getting market data: {e}")
+            return None
+    
+    def _get_content_hash(self, session, target_date: date, market_symbol: str) -> Tuple[str, int]:
+        """
+        Fingerprint the analyses a report for this date and market would be built from
+        
+        Returns:
+            Tuple of (sha256 hex digest, number of analyzed events)
+        """
+        latest_created_at, analyzed_count = session.execute(
+            select(
+                func.max(EventAnalysis.created_at),
+                func.count(distinct(EventAnalysis.event_id))
+            ).join(
+                EconomicEvent, EconomicEvent.id == EventAnalysis.event_id
+            ).where(
+                EconomicEvent.date == target_date,
+                EventAnalysis.market_symbol == market_symbol
+            )
+        ).one()
+        
+        key = f"{target_date}|{market_symbol}|{latest_created_at}|{analyzed_count}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest(), analyzed_count
+    
+    def _get_events_with_analyses(self, session, target_date: date, market_symbol: str) -> List[Dict]:
+        """
+        Get events with their analyses for a specific date and market
+        """
+        try:
+            # Latest analysis timestamp per event for this market
+            latest = select(
+                EventAnalysis.event_id,
+                func.max(EventAnalysis.created_at).label('max_created_at')
+            ).where(
+                EventAnalysis.market_symbol == market_symbol
+            ).group_by(EventAnalysis.event_id).subquery()
+            
+            # Events of the date joined with their latest analysis in a single query;
+            # the inner joins only keep events that have been analyzed (relevant for this market).
+            # Only the columns the report needs are selected, as plain rows rather than ORM objects.
+            stmt = select(
+                EconomicEvent.id,
+                EconomicEvent.time,
+                EconomicEvent.currency,
+                EconomicEvent.importance,
+                EconomicEvent.event_name,
+                EconomicEvent.actual,
+                EconomicEvent.forecast,
+                EconomicEvent.previous,
+                EconomicEvent.source_url,
+                EventAnalysis.event_description,
+                EventAnalysis.analysis_text,
+                EventAnalysis.impact_score,
+                EventAnalysis.sentiment_summary,
+                EventAnalysis.search_sources,
+                EventAnalysis.expert_commentary,
+                EventAnalysis.created_at.label('analysis_created_at')
+            ).join(
+                latest, latest.c.event_id == EconomicEvent.id
+            ).join(
+                EventAnalysis,
+                and_(
+                    EventAnalysis.event_id == latest.c.event_id,
+                    EventAnalysis.created_at == latest.c.max_created_at,
+                    EventAnalysis.market_symbol == market_symbol
+                )
+            ).where(
+                EconomicEvent.date == target_date
+            ).order_by(
+                # Numeric importance sorts High > Medium > Low; the string column sorts alphabetically
+                EconomicEvent.time.asc(),
+                EconomicEvent.importance_int.desc()
+            )
+            
+            events_data = []
+            seen_event_ids = set()
+            for row in session.execute(stmt).mappings():
+                # Two analyses with the same timestamp would both match - keep one
+                if row['id'] in seen_event_ids:
+                    continue
+                seen_event_ids.add(row['id'])
+                events_data.append(row)
+            
+            return events_data
+            
+        except Exception as e:
+            logger.error(f"Error getting events with analyses: {e}")
+            return []
+    
+    
+    def _create_html_report(self, target_date: date, market_data: Dict, events_data: List[Dict]) -> str:
+        """
+        Create HTML report content
+        """
+        # Calculate summary statistics and sentiment distribution in a single pass
+        high_impact_events = 0
+        analyzed_events = 0
+        sentiments = Counter()
+        for e in events_data:
+            if e['importance'] == 'High':
+                high_impact_events += 1
+            if e['analysis_text']:
+                analyzed_events += 1
+            if e['sentiment_summary']:
+                sentiments[e['sentiment_summary']] += 1
+        
+        sentiment_counts = {
+            'bullish': sentiments['bullish'],
+            'bearish': sentiments['bearish'],
+            'neutral': sentiments['neutral']
+        }
+        
+        # Prepare the per-event display values; the markup lives in templates/report.html.j2
+        events = []
+        for event in events_data:
+            view = dict(event)
+            view['importance_class'] = f"importance-{event['importance'].lower()}"
+            view['sentiment_class'] = f"sentiment-{event['sentiment_summary']}" if event['sentiment_summary'] else "sentiment-neutral"
+            
+            if event['analysis_text']:
+                # Try to parse analysis_text as JSON, if it fails, use as plain text
+                analysis_display = event['analysis_text']
+                if _JSON_OBJECT_RE.match(analysis_display):
                     try:
-                        import json
-                        if event['analysis_text'].strip().startswith('{'):
-                            parsed_analysis = json.loads(event['analysis_text'])
-                            analysis_display = parsed_analysis.get('analysis_text', event['analysis_text'])
-                    except:
+                        parsed_analysis = json.loads(analysis_display)
+                        analysis_display = parsed_analysis.get('analysis_text', analysis_display)
+                    except ValueError:
                         pass  # Use original text if parsing fails
-                    
-                    # Get key factors if available
-                    key_factors = event.get('search_sources', [])
-                    if isinstance(key_factors, list) and key_factors:
-                        factors_html = "<div class='key-factors'><strong>Key Factors:</strong><ul>"
-                        for factor in key_factors:
-                            factors_html += f"<li>{factor}</li>"
-                        factors_html += "</ul></div>"
-                    else:
-                        factors_html = ""
-                    
-                    # Create impact level description
-                    impact_score = event['impact_score']
-                    if impact_score <= 3:
-                        impact_level = "Low"
-                        impact_description = "Low impact on the market"
-                    elif impact_score <= 6:
-                        impact_level = "Medium"
-                        impact_description = "Moderate impact on the market"
-                    else:
-                        impact_level = "High"
-                        impact_description = "Strong impact on the market"
-                    
-                    # Create sentiment description
-                    sentiment = event['sentiment_summary'] or 'neutral'
-                    sentiment_descriptions = {
-                        'bullish': 'Positive - Expectation of rising prices',
-                        'bearish': 'Negative - Expectation of falling prices',
-                        'neutral': 'Neutral - No clear direction'
-                    }
-                    sentiment_description = sentiment_descriptions.get(sentiment, 'Neutral - No clear direction')
-                    
-                    html += f"""
-                    <div class="analysis">
-                        <h4>🤖 AI Analysis</h4>
-                        <div class="analysis-metrics">
-                            <div class="metric-item" title="{impact_description}">
-                                <span class="metric-label">📊 Market Impact:</span>
-                                <span class="impact-score impact-{impact_level.lower()}">{impact_level} ({impact_score}/10)</span>
-                            </div>
-                            <div class="metric-item" title="{sentiment_description}">
-                                <span class="metric-label">📈 Market Sentiment:</span>
-                                <span class="sentiment {sentiment_class}">{sentiment.title()}</span>
-                            </div>
-                        </div>
-                        <div class="analysis-content">
-                            <p>{analysis_display}</p>
-                            {factors_html}
-                        </div>
-                    </div>
-"""
+                view['analysis_display'] = analysis_display
                 
-                # Add expert commentary section if available
-                if event.get('expert_commentary') and event['expert_commentary'].strip():
-                    html += f"""
-                    <div class="expert-commentary">
-                        <h4>💬 Expert Commentary</h4>
-                        <div class="commentary-content">
-                            <p>{event['expert_commentary']}</p>
-                        </div>
-                    </div>
-"""
+                # Get key factors if available
+                key_factors = event.get('search_sources', [])
+                view['key_factors'] = key_factors if isinstance(key_factors, list) else []
                 
-                html += """
-                </div>
-            </div>
-"""
-        
-        # Get current timestamp for footer
-        current_time = datetime.now().strftime('%m/%d/%Y at %H:%M')
-        
-        html += f"""
-        </div>
+                # Create impact level description
+                view['impact_level'], view['impact_description'] = _impact_level(event['impact_score'])
+                
+                # Create sentiment description
+                sentiment = event['sentiment_summary'] or 'neutral'
+                view['sentiment'] = sentiment
+                view['sentiment_description'] = _SENTIMENT_DESCRIPTIONS.get(sentiment, _SENTIMENT_DESCRIPTIONS['neutral'])
+            
+            events.append(view)
         
-        <div class="footer">
-            <p>Generated by FOMO Bot on {current_time}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        summary = {
+            'total_events': len(events_data),
+            'high_impact_events': high_impact_events,
+            'analyzed_events': analyzed_events,
+            'sentiment_counts': sentiment_counts
+        }
         
-        return html
+        return _REPORT_TEMPLATE.render(
+            date=target_date,
+            market=market_data,
+            events=events,
+            summary=summary,
+            generated_at=datetime.now()
+        )
     
-    def _save_report_to_db(self, target_date: date, market_id: int, html_content: str) -> Optional[int]:
+    def _save_report_to_db(self, session, target_date: date, market_id: int, html_content: str,
+                           content_hash: Optional[str] = None) -> Optional[int]:
         """
         Save report to database using ORM
         """
         try:
-            session = get_db_session()
-            
-            report = Report(
-                date=target_date,
-                market_id=market_id,
-                report_html=html_content
-            )
-            
-            session.add(report)
-            session.commit()
-            report_id = report.id
-            session.close()
+            # Single INSERT ... RETURNING statement, no ORM flush/refresh; the caller's transaction block commits
+            report_id = session.execute(
+                insert(Report).values(
+                    date=target_date,
+                    market_id=market_id,
+                    report_html_gz=Report.compress_html(html_content),
+                    content_hash=content_hash
+                ).returning(Report.id)
+            ).scalar_one()
             
             logger.info(f"Saved report for {target_date} with ID {report_id}")
             return report_id
@@ -638,26 +620,23 @@ class ReportGenerator:
         Get report by ID using ORM
         """
         try:
-            session = get_db_session()
-            report = session.query(Report).join(Market).filter(Report.id == report_id).first()
-            
-            if not report:
-                session.close()
-                return None
-            
-            # Extract data while session is still open
-            result = {
-                'id': report.id,
-                'date': report.date,
-                'market_id': report.market_id,
-                'report_html': report.report_html,
-                'created_at': report.created_at,
-                'market_symbol': report.market.symbol,
-                'market_description': report.market.description
-            }
-            
-            session.close()
-            return result
+            with SessionLocal() as session:
+                # Primary-key lookup, loading the market in the same query
+                report = session.get(Report, report_id, options=[joinedload(Report.market)])
+                
+                if not report:
+                    return None
+                
+                # Extract data while session is still open
+                return {
+                    'id': report.id,
+                    'date': report.date,
+                    'market_id': report.market_id,
+                    'report_html': report.report_html,
+                    'created_at': report.created_at,
+                    'market_symbol': report.market.symbol,
+                    'market_description': report.market.description
+                }
             
         except Exception as e:
             logger.error(f"Error getting report: {e}")
@@ -673,6 +652,28 @@ def generate_report(target_date: date = None, market_symbol: str = "FDAX") -> Op
     generator = ReportGenerator()
     return generator.generate_economic_calendar_report(target_date, market_symbol)
 
+def generate_reports(market_symbols: List[str], target_date: date = None, max_workers: int = 4) -> List[Optional[Dict]]:
+    """
+    Generate reports for several markets in parallel
+    
+    Each report runs in its own worker thread with its own session; WAL mode lets the
+    reads overlap while the report inserts are serialized by SQLite.
+    
+    Returns:
+        List of report results (or None on failure) in the order of market_symbols
+    """
+    if target_date is None:
+        target_date = date.today()
+    if not market_symbols:
+        return []
+    
+    generator = ReportGenerator()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(market_symbols))) as executor:
+        return list(executor.map(
+            lambda market_symbol: generator.generate_economic_calendar_report(target_date, market_symbol),
+            market_symbols
+        ))
+
 if __name__ == "__main__":
     # Test the report generator
     print("Testing Report Generator...")
@@ -1,68 +1,249 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-from datetime import datetime, date, time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from lxml import etree
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import requests
+from datetime import datetime, date, time, timedelta
 from pathlib import Path
+import atexit
+import functools
 import time as time_module
 import json
-from typing import List, Dict, Optional
+import threading
+from typing import Iterable, List, Dict, Optional
 import logging
-from models import get_db_session, Market, EconomicEvent
-from timezone_utils import convert_event_time_to_user_timezone
+from models import get_db_session, Market, EconomicEvent, IMPORTANCE_LEVELS
+from timezone_utils import convert_event_time_to_user_timezone, get_user_timezone, get_utc_offset_for_date
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class attribute contains the given class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# XPath expressions for the calendar rows and their cells, compiled once at import
+_TIME_TEXT_XPATH = etree.XPath(f"(.//*[{_has_class('time')}])[1]//text()")
+_CURRENCY_TEXT_XPATH = etree.XPath(f"(.//*[{_has_class('left')} and {_has_class('flagCur')}])[1]//text()")
+_EVENT_NAME_TEXT_XPATH = etree.XPath(f"(.//*[{_has_class('event')}])[1]//text()")
+_BULL_COUNT_XPATH = etree.XPath(f"count(.//*[{_has_class('sentiment')}]//i[{_has_class('grayFullBullishIcon')}])")
+_ACTUAL_TEXT_XPATH = etree.XPath("(.//td[contains(@class, 'act')])[1]//text()")
+_FORECAST_TEXT_XPATH = etree.XPath("(.//td[contains(@class, 'fore')])[1]//text()")
+_PREVIOUS_TEXT_XPATH = etree.XPath("(.//td[contains(@class, 'prev')])[1]//text()")
+
+@functools.lru_cache(maxsize=256)
+def _parse_time_text(time_text: str) -> Optional[time]:
+    """
+    Parse a calendar time string ("08:30", "8:30 AM", "All Day") to a time object
+    
+    A day's calendar only uses a few dozen distinct times, so results are cached.
+    """
+    try:
+        if not time_text or time_text == 'All Day':
+            return None
+        
+        # 12-hour format ("8:30 AM")
+        if time_text[-2:] in ('AM', 'PM', 'am', 'pm'):
+            return datetime.strptime(time_text, '%I:%M %p').time()
+        
+        # 24-hour format ("08:30"), ignoring anything after the minutes
+        if ':' in time_text:
+            hour, minute = time_text.split(':', 1)
+            return time(int(hour), int(minute[:2]))
+        return None
+    except ValueError:
+        return None
+
+def _joined_text(text_nodes: List[str]) -> str:
+    """Join text nodes with each one stripped, like BeautifulSoup's get_text(strip=True)"""
+    return "".join(text.strip() for text in text_nodes)
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# XHR endpoint the calendar page itself uses to load the event table for a date range
+_CALENDAR_DATA_URL = "https://www.investing.com/economic-calendar/Service/getCalendarFilteredData"
+_CALENDAR_TIMEZONE_UTC = 55  # investing.com timezone id for UTC - event times are converted from UTC below
+
+# Event dict keys stored by save_events_to_db, and the ones refreshed when an event is scraped again
+_EVENT_UPDATE_COLUMNS = (
+    'market_id', 'currency', 'importance', 'importance_int', 'actual', 'forecast', 'previous', 'source_url'
+)
+_EVENT_COLUMNS = ('date', 'time', 'event_name') + _EVENT_UPDATE_COLUMNS
+
+# Raw calendar HTML of recent fetches, one file per date, so a repeated scrape can skip the download
+_CALENDAR_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "calendar"
+_CALENDAR_CACHE_TTL = 3600.0
+
+# Resources the Selenium fallback doesn't need to render the event table
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.woff", "*.woff2", "*.ttf",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*", "*googlesyndication*"
+]
+
 class EconomicCalendarScraper:
-    def __init__(self):
+    # One headless Chrome is shared by all scrapers in the process - starting Chrome takes
+    # several seconds and dwarfs the scrape itself. The lock serializes its use across threads.
+    _shared_driver = None
+    _driver_lock = threading.Lock()
+    _http_session = None
+    # Dates known to have events already, with the monotonic time they were confirmed
+    _events_exist_cache: Dict[date, float] = {}
+    _events_exist_ttl = 300.0
+    
+    def __init__(self, session=None):
         self.base_url = "https://www.investing.com/economic-calendar/"
         self.driver = None
+        # Database session shared by the existence check, market lookup and save;
+        # opened on demand by _session() unless one is passed in
+        self._session_obj = session
+    
+    @contextmanager
+    def _session(self):
+        """
+        Yield the scraper's database session, opening one if none is active
+        
+        The block that opened the session closes it, so everything run inside it
+        (including nested blocks) shares a single session.
+        """
+        if self._session_obj is not None:
+            yield self._session_obj
+            return
+        
+        self._session_obj = get_db_session()
+        try:
+            yield self._session_obj
+        finally:
+            self._session_obj.close()
+            self._session_obj = None
         
     def _setup_driver(self):
-        """Setup Chrome WebDriver with headless options"""
+        """Get the shared Chrome WebDriver, starting it with headless options if needed"""
+        cls = EconomicCalendarScraper
+        if cls._shared_driver is not None and self._driver_is_alive(cls._shared_driver):
+            self.driver = cls._shared_driver
+            return True
+        
+        # Replace a dead or missing driver
+        cls.close_shared_driver()
+        
         options = Options()
         options.add_argument("--headless")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        options.add_argument(f"--user-agent={_USER_AGENT}")
+        
+        # Only the HTML table is needed - don't download images, stylesheets or fonts
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
         
         try:
-            self.driver = webdriver.Chrome(options=options)
+            cls._shared_driver = webdriver.Chrome(options=options)
+            self.driver = cls._shared_driver
+            
+            # Block fonts and the ad/analytics scripts that dominate the page weight
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                logger.warning(f"Could not block page resources: {e}")
             return True
         except Exception as e:
             logger.error(f"Error setting up Chrome driver: {e}")
             return False
     
+    @staticmethod
+    def _driver_is_alive(driver) -> bool:
+        """Check that the browser behind a WebDriver still responds"""
+        try:
+            return driver.session_id is not None and driver.current_url is not None
+        except Exception:
+            return False
+    
     def _cleanup_driver(self):
-        """Clean up the WebDriver"""
+        """Reset the shared WebDriver for the next scrape, keeping the browser running"""
         if self.driver:
             try:
-                self.driver.quit()
+                self.driver.delete_all_cookies()
             except Exception as e:
-                logger.error(f"Error closing driver: {e}")
+                logger.error(f"Error resetting driver, closing it: {e}")
+                EconomicCalendarScraper.close_shared_driver()
             finally:
                 self.driver = None
     
+    @contextmanager
+    def _driver_session(self):
+        """
+        Hold the shared WebDriver for one scrape and reset it afterwards
+        
+        Yields the driver, or None if it could not be started.
+        """
+        with EconomicCalendarScraper._driver_lock:
+            if not self._setup_driver():
+                yield None
+                return
+            
+            try:
+                yield self.driver
+            finally:
+                self._cleanup_driver()
+    
+    @classmethod
+    def close_shared_driver(cls):
+        """Quit the shared WebDriver (registered to run at interpreter exit)"""
+        if cls._shared_driver:
+            try:
+                cls._shared_driver.quit()
+            except Exception as e:
+                logger.error(f"Error closing driver: {e}")
+            finally:
+                cls._shared_driver = None
+    
     def _events_exist_for_date(self, target_date: date) -> bool:
         """
         Check if events already exist for the given date
+        
+        Positive answers are cached for a few minutes; a missing date is always re-checked
+        since it is about to be scraped.
         """
+        cls = EconomicCalendarScraper
+        confirmed_at = cls._events_exist_cache.get(target_date)
+        if confirmed_at is not None and time_module.monotonic() - confirmed_at < cls._events_exist_ttl:
+            return True
+        
         try:
-            session = get_db_session()
-            event_count = session.query(EconomicEvent).filter(EconomicEvent.date == target_date).count()
-            session.close()
-            return event_count > 0
+            with self._session() as session:
+                # Only existence matters - stop at the first row instead of counting them all
+                events_exist = session.query(EconomicEvent.id).filter(
+                    EconomicEvent.date == target_date
+                ).limit(1).first() is not None
+            if events_exist:
+                cls._events_exist_cache[target_date] = time_module.monotonic()
+            return events_exist
         except Exception as e:
             logger.error(f"Error checking existing events: {e}")
             return False
         
-    def get_economic_events(self, target_date: date = None) -> List[Dict]:
+    def get_economic_events(self, target_date: date = None, use_cache: bool = True) -> List[Dict]:
         """
         Scrape economic events from investing.com for a specific date using Selenium
         Only scrapes once per day - checks if events already exist for the date
+        
+        With use_cache, a calendar page fetched within the last hour is parsed again
+        instead of being downloaded.
         """
         if target_date is None:
             target_date = date.today()
@@ -72,31 +253,167 @@ class EconomicCalendarScraper:
             logger.info(f"Events already exist for {target_date}, skipping scraping")
             return []
             
+        if use_cache:
+            html = self._read_cached_html(target_date)
+            if html is not None:
+                events = self._parse_events_html(html, target_date)
+                logger.info(f"Parsed {len(events)} economic events from the cached calendar page")
+                return events
+        
         logger.info(f"Scraping economic events for {target_date}")
         
-        # Setup WebDriver
-        if not self._setup_driver():
-            logger.error("Failed to setup WebDriver")
-            return []
+        # The calendar's own XHR endpoint returns just the event rows - no browser needed
+        events = self._fetch_events_via_http(target_date)
+        if events is not None:
+            logger.info(f"Scraped {len(events)} economic events")
+            return events
         
-        try:
-            # Navigate to the economic calendar
-            self.driver.get(self.base_url)
-            time_module.sleep(5)  # Let JavaScript load fully
-            
-            # Parse the page source with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+        # Fall back to rendering the full page in Chrome, e.g. when the endpoint blocks plain HTTP clients
+        logger.info("Calendar endpoint unavailable, falling back to Selenium")
+        with self._driver_session() as driver:
+            if driver is None:
+                logger.error("Failed to setup WebDriver")
+                return []
             
-            events = []
-            # Use the CSS selector from your working code
-            for row in soup.select("tr.js-event-item"):
+            return self._scrape_events(target_date)
+    
+    @staticmethod
+    def _cached_html_path(target_date: date) -> Path:
+        """Get the cache file of the calendar HTML for a date"""
+        return _CALENDAR_CACHE_DIR / f"{target_date.isoformat()}.html"
+    
+    def _read_cached_html(self, target_date: date) -> Optional[str]:
+        """Read the cached calendar HTML for a date, or None if there is no fresh copy"""
+        path = self._cached_html_path(target_date)
+        try:
+            if time_module.time() - path.stat().st_mtime >= _CALENDAR_CACHE_TTL:
+                return None
+            return path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading cached calendar page: {e}")
+            return None
+    
+    def _write_cached_html(self, target_date: date, html: str):
+        """Store fetched calendar HTML for a date"""
+        path = self._cached_html_path(target_date)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so a concurrent reader never sees a partial page
+            temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            temp_path.write_text(html, encoding='utf-8')
+            temp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Error caching calendar page: {e}")
+    
+    def invalidate_cached_html(self, target_dates: Iterable[date]):
+        """Drop the cached calendar HTML of the given dates"""
+        for target_date in target_dates:
+            try:
+                self._cached_html_path(target_date).unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Error removing cached calendar page: {e}")
+    
+    @classmethod
+    def _get_http_session(cls) -> requests.Session:
+        """
+        Get the class-level HTTP session so the connection to investing.com is reused across scrapes
+        """
+        if cls._http_session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': _USER_AGENT,
+                'X-Requested-With': 'XMLHttpRequest',
+                'Referer': "https://www.investing.com/economic-calendar/"
+            })
+            cls._http_session = session
+        return cls._http_session
+    
+    def _fetch_events_via_http(self, target_date: date) -> Optional[List[Dict]]:
+        """
+        Fetch the event rows for a date from the calendar's XHR endpoint
+        
+        Returns:
+            List of events, or None if the endpoint could not be used
+        """
+        try:
+            response = self._get_http_session().post(
+                _CALENDAR_DATA_URL,
+                data={
+                    'dateFrom': target_date.isoformat(),
+                    'dateTo': target_date.isoformat(),
+                    'timeZone': _CALENDAR_TIMEZONE_UTC,
+                    'timeFilter': 'timeOnly',
+                    'currentTab': 'custom',
+                    'submitFilters': 1,
+                    'limit_from': 0
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+            rows_html = response.json()['data']
+        except Exception as e:
+            logger.warning(f"Error fetching calendar data via HTTP: {e}")
+            return None
+        
+        # The endpoint returns bare <tr> rows; wrap them so the parser keeps them as table rows
+        html = f"<table>{rows_html}</table>"
+        self._write_cached_html(target_date, html)
+        return self._parse_events_html(html, target_date)
+    
+    def _parse_events_html(self, html: str, target_date: date) -> List[Dict]:
+        """
+        Parse the tr.js-event-item rows of calendar HTML into event dicts
+        """
+        # Look up the configured timezone and its offset for this date once for all rows
+        user_timezone = get_user_timezone()
+        utc_offset = get_utc_offset_for_date(target_date, user_timezone)
+        
+        events = []
+        # Stream-parse the page and handle each row as soon as it is complete, instead of
+        # building the whole document tree first
+        for _, row in etree.iterparse(BytesIO(html.encode('utf-8')), events=('end',), tag='tr', html=True,
+                                       encoding='utf-8'):
+            if 'js-event-item' in (row.get('class') or '').split():
                 try:
-                    event_data = self._parse_event_row_selenium(row, target_date)
+                    event_data = self._parse_event_row_selenium(row, target_date, user_timezone, utc_offset)
                     if event_data:
                         events.append(event_data)
                 except Exception as e:
                     logger.error(f"Error parsing event row: {e}")
-                    continue
+            
+            # Free the processed row and the rows before it
+            row.clear()
+            parent = row.getparent()
+            if parent is not None:
+                while row.getprevious() is not None:
+                    del parent[0]
+        return events
+    
+    def _scrape_events(self, target_date: date) -> List[Dict]:
+        """
+        Load the calendar page in the WebDriver and parse its event rows
+        """
+        try:
+            # Navigate to the economic calendar
+            self.driver.get(self.base_url)
+            
+            # Wait until JavaScript has rendered the event rows instead of sleeping a fixed time
+            rows_rendered = True
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "tr.js-event-item"))
+                )
+            except TimeoutException:
+                rows_rendered = False
+                logger.warning("Timed out waiting for calendar event rows, parsing the page as loaded")
+            
+            page_source = self.driver.page_source
+            # Don't keep an incomplete page around for the next scrape
+            if rows_rendered:
+                self._write_cached_html(target_date, page_source)
+            events = self._parse_events_html(page_source, target_date)
             
             logger.info(f"Scraped {len(events)} economic events")
             return events
@@ -104,35 +421,24 @@ class EconomicCalendarScraper:
         except Exception as e:
             logger.error(f"Error during scraping: {e}")
             return []
-        finally:
-            self._cleanup_driver()
     
-    def _parse_event_row_selenium(self, row, target_date: date) -> Optional[Dict]:
+    def _parse_event_row_selenium(self, row, target_date: date, user_timezone: Optional[str] = None,
+                                  utc_offset: Optional[timedelta] = None) -> Optional[Dict]:
         """
         Parse a single event row using the Selenium-based approach
         No market filtering - all events are saved
         """
         try:
-            # Extract data using the selectors from your working code
-            event_time_elem = row.select_one(".time")
-            currency_elem = row.select_one(".left.flagCur")
-            event_name_elem = row.select_one(".event")
+            # Extract text values with the precompiled XPath expressions
+            time_text = _joined_text(_TIME_TEXT_XPATH(row))
+            currency = _joined_text(_CURRENCY_TEXT_XPATH(row))
+            event_name = _joined_text(_EVENT_NAME_TEXT_XPATH(row))
+            actual = _joined_text(_ACTUAL_TEXT_XPATH(row))
+            forecast = _joined_text(_FORECAST_TEXT_XPATH(row))
+            previous = _joined_text(_PREVIOUS_TEXT_XPATH(row))
             
             # Count the ACTIVE bull icons for importance
-            importance_bulls = len(row.select(".sentiment i.grayFullBullishIcon"))
-            
-            # Extract actual, forecast, previous values
-            actual_elem = row.select_one("td[class*='act']")
-            forecast_elem = row.select_one("td[class*='fore']")
-            previous_elem = row.select_one("td[class*='prev']")
-            
-            # Extract text values
-            time_text = event_time_elem.get_text(strip=True) if event_time_elem else ""
-            currency = currency_elem.get_text(strip=True) if currency_elem else ""
-            event_name = event_name_elem.get_text(strip=True) if event_name_elem else ""
-            actual = actual_elem.get_text(strip=True) if actual_elem else ""
-            forecast = forecast_elem.get_text(strip=True) if forecast_elem else ""
-            previous = previous_elem.get_text(strip=True) if previous_elem else ""
+            importance_bulls = int(_BULL_COUNT_XPATH(row))
             
             # Convert importance count to text
             importance = self._convert_importance_count(importance_bulls)
@@ -142,11 +448,16 @@ class EconomicCalendarScraper:
             
             # Convert time to user's configured timezone
             # investing.com times are typically in UTC or GMT
-            converted_time = convert_event_time_to_user_timezone(
-                event_time, 
-                target_date, 
-                source_timezone='UTC'  # investing.com typically uses UTC
-            )
+            if event_time is not None and utc_offset is not None:
+                # The offset is constant for the whole date, so this is a plain shift
+                converted_time = (datetime.combine(target_date, event_time) + utc_offset).time()
+            else:
+                converted_time = convert_event_time_to_user_timezone(
+                    event_time, 
+                    target_date, 
+                    source_timezone='UTC',  # investing.com typically uses UTC
+                    user_timezone=user_timezone
+                )
             
             # Don't set market_id - events are market-agnostic
             # LLM will determine relevance later
@@ -157,6 +468,7 @@ class EconomicCalendarScraper:
                 'time': converted_time,  # Use converted time
                 'currency': currency,
                 'importance': importance,
+                'importance_int': IMPORTANCE_LEVELS[importance],
                 'event_name': event_name,
                 'actual': actual if actual and actual != '-' else None,
                 'forecast': forecast if forecast and forecast != '-' else None,
@@ -172,20 +484,7 @@ class EconomicCalendarScraper:
         """
         Parse time string to time object
         """
-        try:
-            if not time_text or time_text == 'All Day':
-                return None
-            
-            # Handle different time formats
-            if ':' in time_text:
-                time_part = time_text.split()[0]  # Get time part before AM/PM
-                if 'AM' in time_text or 'PM' in time_text:
-                    return datetime.strptime(time_text, '%I:%M %p').time()
-                else:
-                    return datetime.strptime(time_part, '%H:%M').time()
-            return None
-        except:
-            return None
+        return _parse_time_text(time_text)
     
     def _convert_importance_count(self, bull_count: int) -> str:
         """
@@ -203,10 +502,9 @@ class EconomicCalendarScraper:
         Get market_id from database for given symbol using ORM
         """
         try:
-            session = get_db_session()
-            market = session.query(Market).filter(Market.symbol == market_symbol).first()
-            session.close()
-            return market.id if market else None
+            with self._session() as session:
+                market_id = session.query(Market.id).filter(Market.symbol == market_symbol).scalar()
+            return market_id
         except Exception as e:
             logger.error(f"Error getting market_id: {e}")
             return None
@@ -214,57 +512,38 @@ class EconomicCalendarScraper:
     
     def save_events_to_db(self, events: List[Dict]) -> int:
         """
-        Save scraped events to database using ORM
+        Save scraped events to database with a single upsert statement
+        
+        New events are inserted; events already stored for the same date, name and time
+        get their values (actual, forecast, ...) updated.
         """
         if not events:
             return 0
             
         try:
-            session = get_db_session()
-            saved_count = 0
-            
-            for event_data in events:
+            rows = [{column: event_data[column] for column in _EVENT_COLUMNS} for event_data in events]
+            stmt = sqlite_insert(EconomicEvent).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=EconomicEvent.natural_key(),
+                set_={column: stmt.excluded[column] for column in _EVENT_UPDATE_COLUMNS}
+            )
+            with self._session() as session:
                 try:
-                    # Check if event already exists
-                    existing_event = session.query(EconomicEvent).filter(
-                        EconomicEvent.date == event_data['date'],
-                        EconomicEvent.event_name == event_data['event_name'],
-                        EconomicEvent.time == event_data['time']
-                    ).first()
-                    
-                    if existing_event:
-                        # Update existing event
-                        existing_event.market_id = event_data['market_id']
-                        existing_event.currency = event_data['currency']
-                        existing_event.importance = event_data['importance']
-                        existing_event.actual = event_data['actual']
-                        existing_event.forecast = event_data['forecast']
-                        existing_event.previous = event_data['previous']
-                        existing_event.source_url = event_data['source_url']
-                    else:
-                        # Create new event
-                        event = EconomicEvent(
-                            date=event_data['date'],
-                            market_id=event_data['market_id'],
-                            time=event_data['time'],
-                            currency=event_data['currency'],
-                            importance=event_data['importance'],
-                            event_name=event_data['event_name'],
-                            actual=event_data['actual'],
-                            forecast=event_data['forecast'],
-                            previous=event_data['previous'],
-                            source_url=event_data['source_url']
-                        )
-                        session.add(event)
-                    
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving event: {e}")
-                    continue
+                    session.execute(stmt)
+                    session.commit()
+                except Exception:
+                    # Leave a shared session usable for the caller
+                    session.rollback()
+                    raise
             
-            session.commit()
-            session.close()
+            saved_dates = {row['date'] for row in rows}
+            now = time_module.monotonic()
+            for event_date in saved_dates:
+                EconomicCalendarScraper._events_exist_cache[event_date] = now
+            # The events are stored now, so their pages won't be parsed again
+            self.invalidate_cached_html(saved_dates)
             
+            saved_count = len(rows)
             logger.info(f"Saved {saved_count} events to database")
             return saved_count
             
@@ -272,13 +551,37 @@ class EconomicCalendarScraper:
             logger.error(f"Error saving events to database: {e}")
             return 0
 
+atexit.register(EconomicCalendarScraper.close_shared_driver)
+
 def scrape_and_save_events(target_date: date = None) -> int:
     """
     Convenience function to scrape and save economic events
     """
     scraper = EconomicCalendarScraper()
-    events = scraper.get_economic_events(target_date)
-    return scraper.save_events_to_db(events)
+    # One session for the existence check and the save
+    with scraper._session():
+        events = scraper.get_economic_events(target_date)
+        return scraper.save_events_to_db(events)
+
+def scrape_and_save_events_for_dates(target_dates: Iterable[date], max_workers: int = 4) -> int:
+    """
+    Scrape several dates in parallel and save all their events at once
+    
+    The fetches are I/O-bound and run in worker threads, each with its own scraper.
+    Selenium fallbacks share the one browser and run one at a time.
+    """
+    target_dates = list(dict.fromkeys(target_dates))
+    if not target_dates:
+        return 0
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(target_dates))) as executor:
+        results = executor.map(
+            lambda target_date: EconomicCalendarScraper().get_economic_events(target_date),
+            target_dates
+        )
+        events = [event_data for date_events in results for event_data in date_events]
+    
+    return EconomicCalendarScraper().save_events_to_db(events)
 
 if __name__ == "__main__":
     # Test the scraper
@@ -3,35 +3,82 @@
 Timezone utilities for converting event times to user's configured timezone
 """
 
-from datetime import datetime, time, timezone
-import pytz
+from datetime import datetime, time, timedelta, timezone
+import functools
+from zoneinfo import ZoneInfo
 import logging
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Display names of the supported timezones
+_TIMEZONE_DISPLAY = {
+    'Europe/Berlin': 'Deutschland (CET/CEST)',
+    'Europe/London': 'Großbritannien (GMT/BST)',
+    'America/New_York': 'New York (EST/EDT)',
+    'America/Chicago': 'Chicago (CST/CDT)',
+    'America/Los_Angeles': 'Los Angeles (PST/PDT)',
+    'Asia/Tokyo': 'Japan (JST)',
+    'Asia/Shanghai': 'China (CST)',
+    'Australia/Sydney': 'Sydney (AEST/AEDT)',
+    'UTC': 'UTC (Coordinated Universal Time)'
+}
+
+# Timezone choices offered in the configuration
+_TIMEZONE_CHOICES = [
+    ('Europe/Berlin', '🇩🇪 Deutschland (CET/CEST)'),
+    ('Europe/London', '🇬🇧 Großbritannien (GMT/BST)'),
+    ('America/New_York', '🇺🇸 New York (EST/EDT)'),
+    ('America/Chicago', '🇺🇸 Chicago (CST/CDT)'),
+    ('America/Los_Angeles', '🇺🇸 Los Angeles (PST/PDT)'),
+    ('Asia/Tokyo', '🇯🇵 Japan (JST)'),
+    ('Asia/Shanghai', '🇨🇳 China (CST)'),
+    ('Australia/Sydney', '🇦🇺 Sydney (AEST/AEDT)'),
+    ('UTC', '🌍 UTC (Coordinated Universal Time)')
+]
+
+@functools.lru_cache(maxsize=1)
+def _load_user_timezone() -> str:
+    """
+    Read the configured timezone from the database once; errors propagate and are not cached
+    """
+    from models import get_db_session, Config
+    
+    session = get_db_session()
+    config = session.query(Config).first()
+    session.close()
+    
+    if config and config.timezone:
+        return config.timezone
+    else:
+        return 'Europe/Berlin'  # Default timezone
+
 def get_user_timezone() -> str:
     """
     Get the user's configured timezone from the database
     Defaults to Europe/Berlin if not configured
     """
     try:
-        from models import get_db_session, Config
-        
-        session = get_db_session()
-        config = session.query(Config).first()
-        session.close()
-        
-        if config and config.timezone:
-            return config.timezone
-        else:
-            return 'Europe/Berlin'  # Default timezone
-            
+        return _load_user_timezone()
     except Exception as e:
         logger.error(f"Error getting user timezone: {e}")
         return 'Europe/Berlin'  # Fallback timezone
 
-def convert_event_time_to_user_timezone(event_time: Optional[time], event_date, source_timezone: str = 'UTC') -> Optional[time]:
+def invalidate_user_timezone_cache():
+    """
+    Drop the cached user timezone so the next lookup reads the changed configuration
+    """
+    _load_user_timezone.cache_clear()
+
+@functools.lru_cache(maxsize=32)
+def _get_timezone(timezone_str: str):
+    """
+    Get the ZoneInfo object for a timezone name, built once per name
+    """
+    return ZoneInfo(timezone_str)
+
+def convert_event_time_to_user_timezone(event_time: Optional[time], event_date, source_timezone: str = 'UTC',
+                                        user_timezone: Optional[str] = None) -> Optional[time]:
     """
     Convert an event time from source timezone to user's configured timezone
     
@@ -39,6 +86,7 @@ def convert_event_time_to_user_timezone(event_time: Optional[time], event_date,
         event_time: The time of the event (can be None for all-day events)
         event_date: The date of the event
         source_timezone: The timezone the event is originally in (default: UTC)
+        user_timezone: The target timezone; looked up from the configuration if not given
         
     Returns:
         The converted time in user's timezone, or None if event_time was None
@@ -49,21 +97,21 @@ def convert_event_time_to_user_timezone(event_time: Optional[time], event_date,
             return None
         
         # Get user's timezone
-        user_tz = get_user_timezone()
+        user_tz = user_timezone or get_user_timezone()
         
         # If source and target timezones are the same, no conversion needed
         if source_timezone == user_tz:
             return event_time
         
         # Create timezone objects
-        source_tz = pytz.timezone(source_timezone)
-        user_tz_obj = pytz.timezone(user_tz)
+        source_tz = _get_timezone(source_timezone)
+        user_tz_obj = _get_timezone(user_tz)
         
         # Create a datetime object with the event date and time
         event_datetime = datetime.combine(event_date, event_time)
         
-        # Localize to source timezone
-        localized_datetime = source_tz.localize(event_datetime)
+        # Attach the source timezone
+        localized_datetime = event_datetime.replace(tzinfo=source_tz)
         
         # Convert to user timezone
         converted_datetime = localized_datetime.astimezone(user_tz_obj)
@@ -76,6 +124,34 @@ def convert_event_time_to_user_timezone(event_time: Optional[time], event_date,
         # Return original time if conversion fails
         return event_time
 
+def get_utc_offset_for_date(event_date, user_timezone: Optional[str] = None) -> Optional[timedelta]:
+    """
+    Get the offset from UTC to the user's timezone that applies for a whole day
+    
+    Args:
+        event_date: The date the UTC event times belong to
+        user_timezone: The target timezone; looked up from the configuration if not given
+        
+    Returns:
+        The offset to add to a UTC time, or None if it changes during the day (DST transition)
+        or cannot be determined, in which case times have to be converted one by one
+    """
+    try:
+        user_tz_obj = _get_timezone(user_timezone or get_user_timezone())
+        
+        # A day holds at most one transition, so comparing its first and last instant is enough
+        day_start = datetime.combine(event_date, time.min, tzinfo=timezone.utc)
+        day_end = datetime.combine(event_date, time.max, tzinfo=timezone.utc)
+        utc_offset = day_start.astimezone(user_tz_obj).utcoffset()
+        if day_end.astimezone(user_tz_obj).utcoffset() != utc_offset:
+            return None
+        
+        return utc_offset
+        
+    except Exception as e:
+        logger.error(f"Error getting timezone offset: {e}")
+        return None
+
 def format_time_with_timezone(event_time: Optional[time], event_date) -> str:
     """
     Format event time with timezone information for display
@@ -93,11 +169,10 @@ def format_time_with_timezone(event_time: Optional[time], event_date) -> str:
             return "All Day"
         
         user_tz = get_user_timezone()
-        user_tz_obj = pytz.timezone(user_tz)
+        user_tz_obj = _get_timezone(user_tz)
         
-        # Create datetime and localize
-        event_datetime = datetime.combine(event_date, event_time)
-        localized_datetime = user_tz_obj.localize(event_datetime)
+        # Create datetime in the user's timezone
+        localized_datetime = datetime.combine(event_date, event_time, tzinfo=user_tz_obj)
         
         # Get timezone abbreviation
         tz_abbr = localized_datetime.strftime('%Z')
@@ -121,35 +196,13 @@ def get_timezone_display_name(timezone_str: str) -> str:
     Returns:
         User-friendly display name
     """
-    timezone_names = {
-        'Europe/Berlin': 'Deutschland (CET/CEST)',
-        'Europe/London': 'Großbritannien (GMT/BST)',
-        'America/New_York': 'New York (EST/EDT)',
-        'America/Chicago': 'Chicago (CST/CDT)',
-        'America/Los_Angeles': 'Los Angeles (PST/PDT)',
-        'Asia/Tokyo': 'Japan (JST)',
-        'Asia/Shanghai': 'China (CST)',
-        'Australia/Sydney': 'Sydney (AEST/AEDT)',
-        'UTC': 'UTC (Coordinated Universal Time)'
-    }
-    
-    return timezone_names.get(timezone_str, timezone_str)
+    return _TIMEZONE_DISPLAY.get(timezone_str, timezone_str)
 
 def get_available_timezones() -> list:
     """
     Get list of available timezones for the configuration
     
     Returns:
-        List of tuples (timezone_string, display_name)
-    """
-    return [
-        ('Europe/Berlin', '🇩🇪 Deutschland (CET/CEST)'),
-        ('Europe/London', '🇬🇧 Großbritannien (GMT/BST)'),
-        ('America/New_York', '🇺🇸 New York (EST/EDT)'),
-        ('America/Chicago', '🇺🇸 Chicago (CST/CDT)'),
-        ('America/Los_Angeles', '🇺🇸 Los Angeles (PST/PDT)'),
-        ('Asia/Tokyo', '🇯🇵 Japan (JST)'),
-        ('Asia/Shanghai', '🇨🇳 China (CST)'),
-        ('Australia/Sydney', '🇦🇺 Sydney (AEST/AEDT)'),
-        ('UTC', '🌍 UTC (Coordinated Universal Time)')
-    ]
+        List of tuples (timezone_string, display_name) - shared, do not modify
+    """
+    return _TIMEZONE_CHOICES
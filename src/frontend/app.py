@@ -1,6 +1,9 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, Response, stream_with_context
+from flask import session as flask_session
 from datetime import datetime, date, timedelta
 from pathlib import Path
+import functools
+import gzip
 import logging
 import sys
 import os
@@ -8,14 +11,19 @@ import json
 import queue
 import threading
 import uuid
+from typing import Optional
 
 # Add backend to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from models import get_db_session, Market, Config, Report, Postmortem
+from sqlalchemy import bindparam, exists, func, or_, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import contains_eager, joinedload, load_only, scoped_session, selectinload
+from models import get_db_connection, SessionLocal, Market, Config, Report, Postmortem, EconomicEvent, EventAnalysis
 from scraper import scrape_and_save_events
-from llm_analyzer import analyze_economic_events
+from llm_analyzer import analyze_economic_events, get_star_filter, LLMAnalyzer
 from report_generator import generate_report, ReportGenerator
+from timezone_utils import invalidate_user_timezone_cache
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -24,17 +32,126 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = 'fomo-bot-secret-key-2024'  # Change this in production
 
-# Global storage for status updates
+# Request-scoped database session: each request thread gets its own session from the shared
+# engine's connection pool, and teardown_appcontext returns it after the response
+db_session = scoped_session(SessionLocal)
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    """Close the request's session (rolling back anything uncommitted) and release its connection"""
+    db_session.remove()
+
+# Responses worth compressing; small bodies aren't worth the CPU
+_COMPRESS_MIMETYPES = {'text/html', 'text/css', 'application/json'}
+_COMPRESS_MIN_SIZE = 500
+
+@app.after_request
+def compress_response(response):
+    """Gzip text responses (report pages in particular) for clients that accept it"""
+    # Streamed responses such as the status event stream must reach the client unbuffered
+    if (response.is_streamed or response.direct_passthrough
+            or response.status_code != 200
+            or response.mimetype not in _COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.accept_encodings):
+        return response
+    
+    data = response.get_data()
+    if len(data) < _COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Report generation runs on a fixed pool of worker threads that is reused across requests;
+# generations beyond the pool size wait in report_jobs, up to _MAX_QUEUED_REPORTS of them
+_REPORT_WORKERS = int(os.environ.get('FOMO_BOT_REPORT_WORKERS', '4'))
+_MAX_QUEUED_REPORTS = 16
+report_jobs = queue.Queue()
+
+# Report generations in progress, (market symbol, date) -> session id, so the same report isn't
+# started twice (e.g. by a double-clicked button) while the first run hasn't saved it yet
+active_generations = {}
+
+# Global storage for status updates, one queue per report generation. queue.Queue is
+# thread-safe and single dict operations are atomic, so no lock is needed around them.
 status_queues = {}
-status_locks = threading.Lock()
+
+# Set by the status stream once it has sent a generation's final update, so the worker
+# doesn't have to linger before moving on to the next report
+status_delivered = {}
+
+@functools.lru_cache(maxsize=1)
+def _load_markets() -> tuple:
+    """
+    Load the markets ordered by symbol once; they only change through the config page
+    """
+    return tuple(
+        {'id': market.id, 'symbol': market.symbol, 'description': market.description}
+        for market in db_session.query(Market).order_by(Market.symbol)
+    )
+
+@functools.lru_cache(maxsize=1)
+def _load_market_ids() -> dict:
+    """
+    Map market symbols to ids, built from the cached market list
+    """
+    return {market['symbol']: market['id'] for market in _load_markets()}
+
+def invalidate_markets_cache():
+    """
+    Drop the cached market list after markets were added, changed or deleted
+    """
+    _load_markets.cache_clear()
+    _load_market_ids.cache_clear()
+    # Report pages show their market; those of a deleted market can no longer be loaded
+    _load_report_page.cache_clear()
+    ReportGenerator.invalidate_market_cache()
+
+@functools.lru_cache(maxsize=1)
+def _load_config_settings() -> Optional[dict]:
+    """
+    Load the settings shown on the config page once; they only change through save_config
+    """
+    config_data = db_session.query(Config).order_by(Config.created_at.desc()).first()
+    if not config_data:
+        return None
+    
+    return {
+        'llm_api_key': config_data.llm_api_key,
+        'llm_model': config_data.llm_model,
+        'news_sources': config_data.news_sources,
+        'chart_folder': config_data.chart_folder,
+        'timezone': config_data.timezone,
+        'star_filter': config_data.star_filter
+    }
+
+# ReportGenerator keeps no per-request state, so one instance serves all requests
+report_generator = ReportGenerator()
+
+def _render_report_page(report_id: int) -> str:
+    """
+    Render the page for a report; unknown ids raise LookupError
+    """
+    report = report_generator.get_report(report_id)
+    if not report:
+        raise LookupError(report_id)
+    return render_template('view_report.html', report_html=report['report_html'], report_id=report_id)
+
+@functools.lru_cache(maxsize=64)
+def _load_report_page(report_id: int) -> bytes:
+    """
+    Render a report's page once and keep it encoded; reports don't change after they are
+    generated. Unknown ids raise LookupError instead of returning None, so misses aren't cached
+    """
+    return _render_report_page(report_id).encode()
 
 def get_available_markets():
     """Get list of available markets using ORM"""
     try:
-        session = get_db_session()
-        markets = session.query(Market).order_by(Market.symbol).all()
-        session.close()
-        return markets
+        return _load_markets()
     except Exception as e:
         logger.error(f"Error getting markets: {e}")
         return []
@@ -61,35 +178,50 @@ def generate_report_route():
         else:
             report_date = date.today()
         
-        # Check if report already exists for this market and date
-        session = get_db_session()
-        existing_report = session.query(Report).join(Market).filter(
-            Market.symbol == market_symbol,
+        market_id = _load_market_ids().get(market_symbol)
+        if market_id is None:
+            return jsonify({'error': f'Unknown market {market_symbol}.'}), 400
+        
+        # Check if report already exists for this market and date; only the id is needed,
+        # so don't load the stored report HTML. Filtering on market_id avoids joining markets
+        # and is answered from the (market_id, date, created_at) index
+        existing_report_id = db_session.query(Report.id).filter(
+            Report.market_id == market_id,
             Report.date == report_date
-        ).first()
-        session.close()
+        ).limit(1).scalar()
         
-        if existing_report:
+        if existing_report_id is not None:
             return jsonify({
                 'exists': True, 
-                'report_id': existing_report.id,
+                'report_id': existing_report_id,
                 'message': f'Report for {market_symbol} on {report_date.strftime("%m/%d/%Y")} already exists!'
             }), 200
         
+        # Running plus waiting generations; refuse new ones while the pool's queue is full
+        if len(active_generations) >= _REPORT_WORKERS + _MAX_QUEUED_REPORTS:
+            return jsonify({'error': 'Too many reports are being generated right now. Please try again shortly.'}), 429
+        
         # Create a unique session ID for this report generation
         session_id = str(uuid.uuid4())
         
-        # Create a queue for this session
-        with status_locks:
-            status_queues[session_id] = queue.Queue()
+        # Claim the market and date; setdefault is atomic, so of two concurrent requests only one wins
+        if active_generations.setdefault((market_symbol, report_date), session_id) != session_id:
+            return jsonify({
+                'error': f'A report for {market_symbol} on {report_date.strftime("%m/%d/%Y")} is already being generated.'
+            }), 409
         
-        # Start report generation in background thread
-        thread = threading.Thread(
-            target=_generate_report_async,
-            args=(session_id, market_symbol, report_date)
-        )
-        thread.daemon = True
-        thread.start()
+        try:
+            # Create a queue for this session
+            status_queues[session_id] = queue.Queue()
+            status_delivered[session_id] = threading.Event()
+            
+            # Run report generation on the worker pool
+            report_jobs.put((session_id, market_symbol, report_date))
+        except Exception:
+            active_generations.pop((market_symbol, report_date), None)
+            status_queues.pop(session_id, None)
+            status_delivered.pop(session_id, None)
+            raise
         
         return jsonify({'session_id': session_id}), 200
             
@@ -100,21 +232,36 @@ def generate_report_route():
 def _send_status(session_id: str, status: str, message: str, progress: int = 0, data: dict = None):
     """Send status update to the queue for a specific session"""
     try:
-        with status_locks:
-            if session_id in status_queues:
-                status_data = {
-                    'status': status,
-                    'message': message,
-                    'progress': progress,
-                    'timestamp': datetime.now().isoformat()
-                }
-                if data:
-                    status_data.update(data)
-                status_queues[session_id].put(status_data)
-                logger.info(f"Status update sent for {session_id}: {message}")
+        status_queue = status_queues.get(session_id)
+        if status_queue is not None:
+            status_data = {
+                'status': status,
+                'message': message,
+                'progress': progress,
+                'timestamp': datetime.now().isoformat()
+            }
+            if data:
+                status_data.update(data)
+            # Serialize once here; the stream only joins the ready-made JSON into its frames
+            status_queue.put((status, json.dumps(status_data)))
+            logger.info(f"Status update sent for {session_id}: {message}")
     except Exception as e:
         logger.error(f"Error sending status: {e}")
 
+# Number of events the analysis of a date will go through: those passing the star filter plus
+# those already analyzed for the market (as in analyze_events_for_date); built once and run on a
+# plain connection, no ORM session needed
+_COUNT_EVENTS_STMT = select(func.count()).select_from(EconomicEvent).where(
+    EconomicEvent.date == bindparam('report_date'),
+    or_(
+        EconomicEvent.importance_int >= bindparam('star_filter'),
+        exists().where(
+            EventAnalysis.event_id == EconomicEvent.id,
+            EventAnalysis.market_symbol == bindparam('market_symbol')
+        )
+    )
+)
+
 def _generate_report_async(session_id: str, market_symbol: str, report_date: date):
     """Background task to generate report with status updates"""
     try:
@@ -133,15 +280,25 @@ def _generate_report_async(session_id: str, market_symbol: str, report_date: dat
         _send_status(session_id, 'running', f'Analyzing events for {market_symbol} market with AI...', 40)
         
         # Get count of events to analyze
-        session = get_db_session()
-        from models import EconomicEvent
-        total_events = session.query(EconomicEvent).filter(EconomicEvent.date == report_date).count()
-        session.close()
+        with get_db_connection() as connection:
+            total_events = connection.execute(_COUNT_EVENTS_STMT, {
+                'report_date': report_date,
+                'star_filter': get_star_filter(),
+                'market_symbol': market_symbol
+            }).scalar()
         
         _send_status(session_id, 'running', f'Starting analysis of {total_events} events...', 45)
         
-        # Define progress callback for granular updates
+        # Define progress callback for granular updates; with many events only every ~2% step
+        # (and the last event) is reported
+        last_reported = 0
+        
         def analysis_progress(current, total, event_name):
+            nonlocal last_reported
+            if current - last_reported < max(1, total // 50) and current != total:
+                return
+            last_reported = current
+            
             # Calculate progress within the 45-70% range (25% total for analysis)
             progress = 45 + int((current / total) * 25)
             # Truncate long event names
@@ -174,48 +331,71 @@ def _generate_report_async(session_id: str, market_symbol: str, report_date: dat
         logger.error(f"Error in async report generation: {e}")
         _send_status(session_id, 'error', f'Error: {str(e)}', 0)
     finally:
-        # Keep the queue alive for a bit to ensure client receives final message
-        import time
-        time.sleep(2)
+        # The report is saved (or failed) - allow generating it again
+        active_generations.pop((market_symbol, report_date), None)
+        
+        # Wait until the client has received the final message, but don't tie up the worker
+        # if it has gone away
+        status_delivered[session_id].wait(timeout=5)
+        status_delivered.pop(session_id, None)
+
+def _report_worker():
+    """Run queued report generations one after another"""
+    while True:
+        session_id, market_symbol, report_date = report_jobs.get()
+        try:
+            _generate_report_async(session_id, market_symbol, report_date)
+        except Exception as e:
+            logger.error(f"Error in report worker: {e}")
+
+# Daemon threads, like the per-request threads they replace, so stopping the app (Ctrl+C) doesn't
+# wait for running generations; concurrent.futures workers would be joined at interpreter exit
+for worker_number in range(_REPORT_WORKERS):
+    threading.Thread(target=_report_worker, name=f'report_{worker_number}', daemon=True).start()
+
+# Status updates sent together in one SSE frame when they queue up faster than they are sent
+_MAX_UPDATES_PER_FRAME = 8
+_SESSION_NOT_FOUND_FRAME = f"data: {json.dumps([{'status': 'error', 'message': 'Session not found'}])}\n\n"
 
 @app.route('/status_stream/<session_id>')
 def status_stream(session_id):
-    """SSE endpoint to stream status updates"""
+    """SSE endpoint to stream status updates; each event carries a JSON list of updates"""
     def generate():
         try:
-            # Wait for queue to be created
-            max_wait = 10  # Wait up to 10 seconds
-            wait_count = 0
-            while session_id not in status_queues and wait_count < max_wait:
-                import time
-                time.sleep(0.1)
-                wait_count += 1
-            
-            if session_id not in status_queues:
-                yield f"data: {json.dumps({'status': 'error', 'message': 'Session not found'})}\n\n"
+            # The queue is registered before generate_report_route returns the session id the
+            # client connects with, so there is nothing to wait for
+            status_queue = status_queues.get(session_id)
+            if status_queue is None:
+                yield _SESSION_NOT_FOUND_FRAME
                 return
+            delivered = status_delivered.get(session_id)
             
             while True:
                 try:
                     # Get status update from queue (timeout after 30 seconds)
-                    status_update = status_queues[session_id].get(timeout=30)
+                    status_updates = [status_queue.get(timeout=30)]
+                    
+                    # Coalesce the updates that are already waiting into the same frame
+                    while (len(status_updates) < _MAX_UPDATES_PER_FRAME
+                           and status_updates[-1][0] not in ['complete', 'error']):
+                        try:
+                            status_updates.append(status_queue.get_nowait())
+                        except queue.Empty:
+                            break
                     
-                    # Send the update
-                    yield f"data: {json.dumps(status_update)}\n\n"
+                    # Send the updates, each already serialized by _send_status
+                    yield f"data: [{','.join(payload for _, payload in status_updates)}]\n\n"
                     
                     # If complete or error, clean up and stop
-                    if status_update['status'] in ['complete', 'error']:
-                        # Clean up the queue after a delay
-                        def cleanup():
-                            import time
-                            time.sleep(5)
-                            with status_locks:
-                                if session_id in status_queues:
-                                    del status_queues[session_id]
+                    if status_updates[-1][0] in ['complete', 'error']:
+                        # Resumed after the frame was written; let the worker move on
+                        if delivered is not None:
+                            delivered.set()
                         
-                        cleanup_thread = threading.Thread(target=cleanup)
-                        cleanup_thread.daemon = True
-                        cleanup_thread.start()
+                        # Clean up the queue after a delay
+                        cleanup_timer = threading.Timer(5, status_queues.pop, (session_id, None))
+                        cleanup_timer.daemon = True
+                        cleanup_timer.start()
                         break
                         
                 except queue.Empty:
@@ -224,24 +404,32 @@ def status_stream(session_id):
                     
         except Exception as e:
             logger.error(f"Error in status stream: {e}")
-            yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
+            yield f"data: {json.dumps([{'status': 'error', 'message': str(e)}])}\n\n"
     
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # Updates are already batched per frame; tell caches and reverse proxies (nginx) not to
+    # hold frames back, or the progress bar would stall until the buffer fills
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/report/<int:report_id>')
 def view_report(report_id):
     """View a specific report"""
     try:
-        generator = ReportGenerator()
-        report = generator.get_report(report_id)
-        
-        if not report:
+        try:
+            if '_flashes' in flask_session:
+                # Pending flash messages are shown on the page, so don't serve (or cache) them
+                page = _render_report_page(report_id)
+            else:
+                # Repeat views skip the database and re-rendering the (large) report HTML
+                page = _load_report_page(report_id)
+        except LookupError:
             flash('Report not found', 'error')
             return redirect(url_for('index'))
         
-        return render_template('view_report.html', 
-                             report_html=report['report_html'],
-                             report_id=report_id)
+        return Response(page, mimetype='text/html')
         
     except Exception as e:
         logger.error(f"Error viewing report: {e}")
@@ -261,28 +449,63 @@ def reports():
         date_from = request.args.get('date_from', '')
         date_to = request.args.get('date_to', '')
         
-        session = get_db_session()
-        
-        # Build query using ORM
-        query = session.query(Report).join(Market)
+        # Bind the date filters as dates; ignore malformed values instead of comparing strings
+        try:
+            date_from_value = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+            date_to_value = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+        except ValueError:
+            flash('Invalid date filter, expected YYYY-MM-DD', 'error')
+            date_from = date_to = ''
+            date_from_value = date_to_value = None
+        
+        session = db_session()
+        
+        # Build query using ORM; the window count gives the total number of matching
+        # reports with every row, so the page and the count come from a single query.
+        # The list only shows metadata - leave the stored report HTML in the database.
+        query = session.query(Report, func.count().over().label('total_count')).join(Market).options(
+            load_only(Report.id, Report.date, Report.market_id, Report.created_at),
+            contains_eager(Report.market).load_only(Market.symbol, Market.description)
+        )
         
         if market_filter:
             query = query.filter(Market.symbol == market_filter)
         
-        if date_from:
-            query = query.filter(Report.date >= date_from)
-        
-        if date_to:
-            query = query.filter(Report.date <= date_to)
-        
-        # Get total count for pagination
-        total_count = query.count()
-        
-        # Get paginated results
-        reports = query.order_by(Report.date.desc(), Report.created_at.desc()).offset(offset).limit(per_page).all()
+        if date_from_value:
+            query = query.filter(Report.date >= date_from_value)
+        
+        if date_to_value:
+            query = query.filter(Report.date <= date_to_value)
+        
+        # "Next" links pass the id of the last report shown; the page then continues right after
+        # that report's sort key (keyset pagination) instead of skipping offset rows, so deep
+        # pages cost the same as the first one
+        after_id = request.args.get('after', type=int)
+        cursor = None
+        if after_id is not None and page > 1:
+            cursor = session.get(Report, after_id, options=[load_only(Report.date, Report.created_at)])
+        
+        # Get paginated results; the id breaks ties so every report has a unique position
+        order_by = (Report.date.desc(), Report.created_at.desc(), Report.id.desc())
+        if cursor is not None and cursor.created_at is not None:
+            page_query = query.filter(
+                tuple_(Report.date, Report.created_at, Report.id) < (cursor.date, cursor.created_at, cursor.id)
+            ).order_by(*order_by)
+            # The window count now only covers the reports from this page on
+            skipped_count = offset
+        else:
+            page_query = query.order_by(*order_by).offset(offset)
+            skipped_count = 0
+        rows = page_query.limit(per_page).all()
+        reports = [row.Report for row in rows]
+        
+        # Get total count for pagination; a page past the end has no rows to carry it
+        if rows:
+            total_count = skipped_count + rows[0].total_count
+        else:
+            total_count = query.with_entities(func.count(Report.id)).scalar() if offset > 0 else 0
         
-        # Get markets while session is still open
-        markets = session.query(Market).order_by(Market.symbol).all()
+        markets = get_available_markets()
         
         # Extract report data while session is still open to avoid lazy loading issues
         reports_data = []
@@ -293,12 +516,9 @@ def reports():
                 'market_id': report.market_id,
                 'created_at': report.created_at,
                 'market_symbol': report.market.symbol,
-                'market_description': report.market.description,
-                'report_html': report.report_html
+                'market_description': report.market.description
             })
         
-        session.close()
-        
         # Calculate pagination info
         total_pages = (total_count + per_page - 1) // per_page
         has_prev = page > 1
@@ -324,10 +544,8 @@ def reports():
 def config():
     """Configuration page"""
     try:
-        session = get_db_session()
-        config_data = session.query(Config).order_by(Config.created_at.desc()).first()
-        markets = session.query(Market).order_by(Market.symbol).all()
-        session.close()
+        config_data = _load_config_settings()
+        markets = get_available_markets()
         
         return render_template('config.html', config=config_data, markets=markets)
         
@@ -347,33 +565,36 @@ def save_config():
         timezone = request.form.get('timezone', 'Europe/Berlin').strip()
         star_filter = int(request.form.get('star_filter', 1))
         
-        session = get_db_session()
-        
-        # Check if config already exists
-        config = session.query(Config).first()
-        
-        if config:
-            # Update existing config
-            config.llm_api_key = llm_api_key
-            config.llm_model = llm_model
-            config.news_sources = news_sources
-            config.chart_folder = chart_folder
-            config.timezone = timezone
-            config.star_filter = star_filter
-        else:
-            # Create new config
-            config = Config(
-                llm_api_key=llm_api_key,
-                llm_model=llm_model,
-                news_sources=news_sources,
-                chart_folder=chart_folder,
-                timezone=timezone,
-                star_filter=star_filter
-            )
-            session.add(config)
+        session = db_session()
         
-        session.commit()
-        session.close()
+        with session.begin():
+            # Check if config already exists
+            config = session.query(Config).first()
+            
+            if config:
+                # Update existing config
+                config.llm_api_key = llm_api_key
+                config.llm_model = llm_model
+                config.news_sources = news_sources
+                config.chart_folder = chart_folder
+                config.timezone = timezone
+                config.star_filter = star_filter
+            else:
+                # Create new config
+                config = Config(
+                    llm_api_key=llm_api_key,
+                    llm_model=llm_model,
+                    news_sources=news_sources,
+                    chart_folder=chart_folder,
+                    timezone=timezone,
+                    star_filter=star_filter
+                )
+                session.add(config)
+        
+        # Make sure the next analysis run / scrape sees the new API key, model, star filter and timezone
+        _load_config_settings.cache_clear()
+        LLMAnalyzer.invalidate_config_cache()
+        invalidate_user_timezone_cache()
         
         flash('Configuration saved successfully!', 'success')
         return redirect(url_for('config'))
@@ -394,18 +615,17 @@ def add_market():
             flash('Market symbol is required', 'error')
             return redirect(url_for('config'))
         
-        session = get_db_session()
+        session = db_session()
         
-        # Check if market already exists
-        existing_market = session.query(Market).filter(Market.symbol == symbol).first()
-        if existing_market:
-            existing_market.description = description
-        else:
-            market = Market(symbol=symbol, description=description)
-            session.add(market)
+        with session.begin():
+            # Insert the market, or update the description if the symbol already exists
+            stmt = sqlite_insert(Market).values(symbol=symbol, description=description)
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=[Market.symbol],
+                set_={'description': stmt.excluded.description}
+            ))
         
-        session.commit()
-        session.close()
+        invalidate_markets_cache()
         
         flash(f'Market {symbol} added successfully!', 'success')
         return redirect(url_for('config'))
@@ -419,25 +639,30 @@ def add_market():
 def delete_market():
     """Delete a market"""
     try:
-        market_id = request.form.get('market_id')
+        market_id = request.form.get('market_id', type=int)
         
-        if not market_id:
+        if market_id is None:
             flash('Market ID is required', 'error')
             return redirect(url_for('config'))
         
-        session = get_db_session()
-        
-        # Check if market exists
-        market = session.query(Market).filter(Market.id == market_id).first()
-        if not market:
-            flash('Market not found', 'error')
-            session.close()
-            return redirect(url_for('config'))
+        session = db_session()
+        
+        with session.begin():
+            # Check if market exists, loading the rows whose market reference the delete has to clear
+            market = session.get(Market, market_id, options=[
+                selectinload(Market.economic_events),
+                selectinload(Market.news_items),
+                selectinload(Market.chart_analyses),
+                selectinload(Market.reports)
+            ])
+            if not market:
+                flash('Market not found', 'error')
+                return redirect(url_for('config'))
+            
+            # Delete the market
+            session.delete(market)
         
-        # Delete the market
-        session.delete(market)
-        session.commit()
-        session.close()
+        invalidate_markets_cache()
         
         flash(f'Market {market.symbol} deleted successfully!', 'success')
         return redirect(url_for('config'))
@@ -451,7 +676,7 @@ def delete_market():
 def postmortem(report_id):
     """Add postmortem reflection to a report"""
     try:
-        session = get_db_session()
+        session = db_session()
         
         if request.method == 'POST':
             reflection_text = request.form.get('reflection_text', '').strip()
@@ -460,23 +685,25 @@ def postmortem(report_id):
                 flash('Reflection text is required', 'error')
                 return redirect(url_for('postmortem', report_id=report_id))
             
-            postmortem = Postmortem(
-                report_id=report_id,
-                reflection_text=reflection_text
-            )
-            session.add(postmortem)
-            session.commit()
-            session.close()
+            with session.begin():
+                postmortem = Postmortem(
+                    report_id=report_id,
+                    reflection_text=reflection_text
+                )
+                session.add(postmortem)
             
             flash('Postmortem saved successfully!', 'success')
             return redirect(url_for('reports'))
         
         # GET request - show form
-        report = session.query(Report).join(Market).filter(Report.id == report_id).first()
+        report = session.get(Report, report_id, options=[
+            load_only(Report.id, Report.date),
+            joinedload(Report.market).load_only(Market.symbol, Market.description)
+        ])
         postmortem_data = session.query(Postmortem).filter(Postmortem.report_id == report_id).order_by(Postmortem.created_at.desc()).first()
         
-        if not report:
-            session.close()
+        # Reports whose market was deleted aren't listed either
+        if not report or report.market is None:
             flash('Report not found', 'error')
             return redirect(url_for('reports'))
         
@@ -489,7 +716,6 @@ def postmortem(report_id):
                 'description': report.market.description
             }
         }
-        session.close()
         
         return render_template('postmortem.html', report=report_data, postmortem=postmortem_data)
         
@@ -505,24 +731,21 @@ def postmortem(report_id):
 def delete_report(report_id):
     """Delete a report"""
     try:
-        session = get_db_session()
+        session = db_session()
         
-        # Check if report exists
-        report = session.query(Report).filter(Report.id == report_id).first()
-        if not report:
-            flash('Report not found', 'error')
-            session.close()
-            return redirect(url_for('reports'))
+        with session.begin():
+            # Delete associated postmortems first, all in one statement
+            session.query(Postmortem).filter(Postmortem.report_id == report_id).delete(synchronize_session=False)
+            
+            # Delete the report; no deleted row means it didn't exist
+            deleted_count = session.query(Report).filter(Report.id == report_id).delete(synchronize_session=False)
         
-        # Delete associated postmortems first
-        postmortems = session.query(Postmortem).filter(Postmortem.report_id == report_id).all()
-        for postmortem in postmortems:
-            session.delete(postmortem)
+        # SQLite may hand the id to the next report, so don't keep serving the deleted HTML
+        _load_report_page.cache_clear()
         
-        # Delete the report
-        session.delete(report)
-        session.commit()
-        session.close()
+        if not deleted_count:
+            flash('Report not found', 'error')
+            return redirect(url_for('reports'))
         
         flash(f'Report deleted successfully!', 'success')
         return redirect(url_for('reports'))
@@ -537,4 +760,4 @@ if __name__ == '__main__':
     templates_dir = Path('templates')
     templates_dir.mkdir(exist_ok=True)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=os.environ.get('FOMO_BOT_DEBUG') == '1', host='0.0.0.0', port=5000)
@@ -19,8 +19,9 @@ def setup_environment():
     """Setup the environment and check dependencies"""
     print("🚀 Starting FOMO Bot...")
     
-    # Check if database exists (relative to project root)
-    db_path = Path(__file__).parent.parent / "database" / "fomo-bot-DB.sqlite"
+    # Check if database exists (relative to project root, or FOMO_BOT_DB if set)
+    from models import get_database_path
+    db_path = get_database_path()
     if not db_path.exists():
         print("❌ Database not found. Please run init_db.py first.")
         print("   Run: cd backend && python init_db.py")
@@ -64,7 +65,8 @@ def main():
         print("⏹️  Press Ctrl+C to stop the server")
         print("-" * 50)
         
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # The debugger and reloader are for development only; enable them with FOMO_BOT_DEBUG=1
+        app.run(debug=os.environ.get('FOMO_BOT_DEBUG') == '1', host='0.0.0.0', port=5000)
         
     except KeyboardInterrupt:
         print("\n👋 FOMO Bot stopped by user")
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+FOMO Bot - WSGI entry point for production servers
+
+Run with e.g.: gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5000 --chdir src wsgi:application
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend and frontend directories to Python path
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent / "frontend"))
+
+from app import app
+
+application = app